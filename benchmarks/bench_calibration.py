@@ -0,0 +1,196 @@
+"""Benchmarks of the calibration solve, correction and loading paths.
+
+Synthetic standards are built from known error terms, every case is timed
+(best of ``--repeat`` runs) and its peak allocation measured with tracemalloc
+in a separate run. Results are written as JSON for comparison between releases:
+
+    python benchmarks/bench_calibration.py --sizes 1000 10000 --output bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from port_calibration import (  # noqa: E402
+    OnePortCalibration,
+    TwoPortCalibration,
+    convert_json_dirs,
+    load_two_port_cals,
+    load_two_port_cals_npy,
+)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def _measured_one_port(D, S, R, gamma):
+    return D + (R * gamma) / (1 - S * gamma)
+
+
+def _thru_measurements(e00, e11, e10e01, e22, e10e32, e33_r, e22_r, e23e32_r, e11_r, e23e01_r):
+    delta_e = e00 * e11 - e10e01
+    throw_sm11 = (e22 * delta_e - e00) / (e22 * e11 - 1)
+    throw_sm21 = e10e32 / (1 - e11 * e22)
+
+    delta_e_r = e33_r * e22_r - e23e32_r
+    throw_sm22 = (e11_r * delta_e_r - e33_r) / (e11_r * e22_r - 1)
+    throw_sm12 = e23e01_r / (1 - e22_r * e11_r)
+
+    return throw_sm11, throw_sm22, throw_sm12, throw_sm21
+
+
+def synthetic_standards(points: int, seed: int = 0) -> dict:
+    """The 12 raw standards of a two port with random error terms"""
+    rng = np.random.default_rng(seed)
+
+    def term(center):
+        return center + 0.01 * (
+            rng.normal(size=points) + 1j * rng.normal(size=points)
+        )
+
+    e00, e11, e33_r, e22_r = term(0.02), term(0.05), term(-0.01), term(0.04)
+    e10e01, e23e32_r = term(0.95), term(1.05)
+    e22, e11_r = term(0.02), term(0.03)
+    e10e32, e23e01_r = term(0.98), term(1.02)
+
+    throw_sm11, throw_sm22, throw_sm12, throw_sm21 = _thru_measurements(
+        e00, e11, e10e01, e22, e10e32, e33_r, e22_r, e23e32_r, e11_r, e23e01_r
+    )
+    return {
+        "load_sm11": _measured_one_port(e00, e11, e10e01, 0.01),
+        "load_sm22": _measured_one_port(e33_r, e22_r, e23e32_r, 0.01),
+        "load_sm12": np.zeros(points, dtype=complex),
+        "load_sm21": np.zeros(points, dtype=complex),
+        "open_sm11": _measured_one_port(e00, e11, e10e01, 0.99),
+        "open_sm22": _measured_one_port(e33_r, e22_r, e23e32_r, 0.99),
+        "short_sm11": _measured_one_port(e00, e11, e10e01, -0.99),
+        "short_sm22": _measured_one_port(e33_r, e22_r, e23e32_r, -0.99),
+        "throw_sm11": throw_sm11,
+        "throw_sm22": throw_sm22,
+        "throw_sm12": throw_sm12,
+        "throw_sm21": throw_sm21,
+    }
+
+
+def write_json_standards(root: str, standards: dict) -> dict:
+    dirs = {}
+    for standard, directory in (
+        ("open", "open"), ("short", "short"), ("load", "load"), ("throw", "through")
+    ):
+        path = os.path.join(root, directory)
+        os.makedirs(path, exist_ok=True)
+        dirs[directory] = path
+        for key, value in standards.items():
+            if key.startswith(standard + "_"):
+                data = {"real": value.real.tolist(), "imag": value.imag.tolist()}
+                with open(os.path.join(path, f"s{key[-2:]}.json"), "w") as f:
+                    json.dump({"data": data}, f)
+    return dirs
+
+
+def cases(points: int, workdir: str) -> dict:
+    """Benchmark name -> zero argument callable"""
+    standards = synthetic_standards(points)
+    kwargs = dict(s11_load=0.01, s11_open=0.99, s11_short=-0.99)
+    cal = TwoPortCalibration(**standards, **kwargs)
+    cal.calibrate()
+    sm = [standards[k] for k in ("throw_sm11", "throw_sm22", "throw_sm12", "throw_sm21")]
+    out = tuple(np.empty(points, dtype=complex) for _ in range(4))
+
+    dirs = write_json_standards(workdir, standards)
+    json_dirs = (dirs["open"], dirs["short"], dirs["load"], dirs["through"])
+    npy_path = os.path.join(workdir, "standards.npy")
+    convert_json_dirs(*json_dirs, npy_path)
+
+    def one_port_solve():
+        OnePortCalibration(
+            standards["open_sm11"],
+            standards["short_sm11"],
+            standards["load_sm11"],
+            s11_open=0.99,
+            s11_short=-0.99,
+            s11_load=0.01,
+        ).calculate_calibration()
+
+    def calc_s():
+        cal.calc_S11(*sm)
+        cal.calc_S22(*sm)
+        cal.calc_S12(*sm)
+        cal.calc_S21(*sm)
+
+    return {
+        "one_port_solve": one_port_solve,
+        "two_port_calibrate": lambda: TwoPortCalibration(**standards, **kwargs).calibrate(),
+        "correct_calc_s": calc_s,
+        "correct_fused": lambda: cal.correct(*sm, out=out),
+        "load_json": lambda: load_two_port_cals(*json_dirs, **kwargs),
+        "load_npy": lambda: load_two_port_cals_npy(npy_path, **kwargs),
+    }
+
+
+def measure(func, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"best_s": min(times), "mean_s": sum(times) / len(times), "peak_bytes": peak}
+
+
+def run(sizes, repeat: int, only=None) -> dict:
+    results = []
+    for points in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            for name, func in cases(points, workdir).items():
+                if only and name not in only:
+                    continue
+                result = {"case": name, "points": points, **measure(func, repeat)}
+                results.append(result)
+                print(
+                    f"{name:>20} {points:>9} points: {result['best_s'] * 1e3:10.2f} ms, "
+                    f"peak {result['peak_bytes'] / 2 ** 20:8.1f} MiB",
+                    flush=True,
+                )
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Run only these cases")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat, args.only)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
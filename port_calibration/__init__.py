@@ -1,3 +1,65 @@
+from importlib import import_module
+
 from .one_port import OnePortCalibration
 from .two_port import TwoPortCalibration
-from .utils import (load_json_data, load_two_port_cals)
+from .sweep import Sweep
+from .utils import (
+    load_json_data,
+    load_two_port_cals,
+    load_two_port_standards,
+    load_two_port_sweeps,
+    StandardsLoadError,
+)
+from . import instrumentation
+
+# Feature modules are imported on first attribute access, so ``port-cal`` and
+# other entry points only pay for the modules they use
+_LAZY = {
+    "storage": (
+        "save_standards",
+        "load_standards",
+        "save_cals",
+        "load_cals",
+        "load_two_port_cals_npy",
+        "convert_json_dirs",
+    ),
+    "cache": ("CalibrationCache",),
+    "streaming": (
+        "iter_chunks",
+        "array_sink",
+        "correct_two_port_stream",
+        "correct_one_port_stream",
+    ),
+    "interpolation": ("FrequencyCalibration",),
+    "touchstone": (
+        "read_touchstone",
+        "write_touchstone",
+        "read_sweep",
+        "write_sweep",
+        "load_two_port_cals_touchstone",
+    ),
+    "time_domain": ("impulse_response", "step_response", "time_gate", "cached_time_domain"),
+    "calibration_set": ("CalibrationSet",),
+    "multiport": ("MultiPortCalibration",),
+    "shared": ("SharedCalibration", "SharedCalibrationStore"),
+    "archive": ("SweepArchive",),
+    "drift": ("check_drift", "check_one_port", "check_two_port"),
+    "library": ("CalibrationLibrary",),
+    "uncertainty": ("MonteCarlo",),
+    "kit": ("CalibrationKit", "OpenStandard", "ShortStandard", "LoadStandard", "Offset"),
+    "averaging": ("SweepAccumulator", "StandardsAccumulator"),
+}
+_LAZY_NAMES = {name: module for module, names in _LAZY.items() for name in names}
+
+
+def __getattr__(name):
+    module = _LAZY_NAMES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_NAMES))
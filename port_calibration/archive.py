@@ -0,0 +1,150 @@
+"""Indexed append-only archive of corrected sweeps.
+
+Each sweep is appended to the current chunk file as its frequency axis
+(float64) followed by a ``(params, N)`` complex128 block, e.g. the four rows
+returned by ``TwoPortCalibration.correct`` or the single row of
+``OnePortCalibration.calibrate_measure``. A fixed size record per sweep is
+appended to ``index.bin``, so the index is a memory mapped structured array
+and queries by time, calibration ID and frequency range never touch the data::
+
+    archive = SweepArchive("archive/")
+    archive.append(frequency, cal.correct(sm11, sm22, sm12, sm21), cal_id="2024-05-01")
+    for record, f, s in archive.read(start=t1, stop=t2, f_min=5e9, f_max=6e9):
+        ...  # f and s are views into the chunk file
+
+Data is written before its index record, so an interrupted append leaves at
+worst unindexed bytes at the end of a chunk. There is a single writer.
+"""
+import os
+import time
+
+import numpy as np
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("cal_id", "S32"),
+        ("chunk", "<i4"),
+        ("params", "<i4"),
+        ("points", "<i8"),
+        ("offset", "<i8"),  # byte offset of the frequency axis in the chunk
+        ("f_min", "<f8"),
+        ("f_max", "<f8"),
+    ]
+)
+
+
+class SweepArchive:
+    """Directory of ``chunk_<k>.bin`` data files and an ``index.bin`` record file"""
+
+    def __init__(self, directory: str, chunk_bytes: int = 256 << 20):
+        """
+        :param directory - Archive directory, created if missing
+        :param chunk_bytes - Size after which appends go to a new chunk file
+        """
+        self.directory = directory
+        self.chunk_bytes = chunk_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._index_path = os.path.join(directory, "index.bin")
+        self._maps = {}
+
+    def _chunk_path(self, chunk: int) -> str:
+        return os.path.join(self.directory, f"chunk_{chunk:06d}.bin")
+
+    def __len__(self) -> int:
+        if not os.path.exists(self._index_path):
+            return 0
+        return os.path.getsize(self._index_path) // INDEX_DTYPE.itemsize
+
+    def index(self) -> np.ndarray:
+        """Memory mapped structured array of all sweep records, INDEX_DTYPE"""
+        count = len(self)
+        if count == 0:
+            return np.zeros(0, dtype=INDEX_DTYPE)
+        return np.memmap(self._index_path, dtype=INDEX_DTYPE, mode="r", shape=(count,))
+
+    def append(self, frequency, s, timestamp: float = None, cal_id: str = "") -> int:
+        """Append one sweep, returns its position in the index.
+
+        :param frequency - Frequency axis (N,)
+        :param s - (params, N) array or sequence of (N,) parameters, e.g. (S11, S22, S12, S21)
+        :param timestamp - Seconds since the epoch, now by default
+        :param cal_id - Identifier of the calibration used, up to 32 bytes
+        """
+        frequency = np.ascontiguousarray(frequency, dtype="<f8")
+        data = np.ascontiguousarray(np.atleast_2d(np.asarray(s)), dtype="<c16")
+        assert frequency.ndim == 1, "Frequency axis must be one dimensional"
+        assert data.ndim == 2 and data.shape[1] == len(frequency), "Expected (params, N) data"
+        cal_id = cal_id.encode()
+        assert len(cal_id) <= 32, "cal_id is limited to 32 bytes"
+
+        position = len(self)
+        chunk = int(self.index()[position - 1]["chunk"]) if position else 0
+        path = self._chunk_path(chunk)
+        offset = os.path.getsize(path) if os.path.exists(path) else 0
+        if offset and offset + frequency.nbytes + data.nbytes > self.chunk_bytes:
+            chunk += 1
+            path, offset = self._chunk_path(chunk), 0
+        with open(path, "ab") as f:
+            f.write(frequency.tobytes())
+            f.write(data.tobytes())
+
+        record = np.zeros(1, dtype=INDEX_DTYPE)
+        record["timestamp"] = time.time() if timestamp is None else timestamp
+        record["cal_id"] = cal_id
+        record["chunk"] = chunk
+        record["params"] = data.shape[0]
+        record["points"] = len(frequency)
+        record["offset"] = offset
+        record["f_min"] = frequency.min() if len(frequency) else np.nan
+        record["f_max"] = frequency.max() if len(frequency) else np.nan
+        with open(self._index_path, "ab") as f:
+            f.write(record.tobytes())
+        return position
+
+    def query(self, start=None, stop=None, cal_id: str = None, f_min=None, f_max=None):
+        """Positions of sweeps taken in [start, stop] whose range overlaps [f_min, f_max]"""
+        index = self.index()
+        mask = np.ones(len(index), dtype=bool)
+        if start is not None:
+            mask &= index["timestamp"] >= start
+        if stop is not None:
+            mask &= index["timestamp"] <= stop
+        if cal_id is not None:
+            mask &= index["cal_id"] == cal_id.encode()
+        if f_min is not None:
+            mask &= index["f_max"] >= f_min
+        if f_max is not None:
+            mask &= index["f_min"] <= f_max
+        return np.flatnonzero(mask)
+
+    def _chunk_map(self, chunk: int, end: int) -> np.memmap:
+        mapped = self._maps.get(chunk)
+        if mapped is None or len(mapped) < end:
+            # the current chunk grows, map it again once it outgrew the old map
+            mapped = self._maps[chunk] = np.memmap(self._chunk_path(chunk), mode="r")
+        return mapped
+
+    def sweep(self, position: int, f_min=None, f_max=None):
+        """(frequency, (params, N) data) of one sweep as views into its chunk file,
+        limited to points within [f_min, f_max] on a sorted frequency axis"""
+        return self._sweep(self.index()[position], f_min, f_max)
+
+    def _sweep(self, record, f_min, f_max):
+        points, params = int(record["points"]), int(record["params"])
+        offset = int(record["offset"])
+        data_offset = offset + 8 * points
+        mapped = self._chunk_map(int(record["chunk"]), data_offset + 16 * params * points)
+        frequency = np.ndarray((points,), dtype="<f8", buffer=mapped, offset=offset)
+        data = np.ndarray((params, points), dtype="<c16", buffer=mapped, offset=data_offset)
+        lo = 0 if f_min is None else np.searchsorted(frequency, f_min, side="left")
+        hi = points if f_max is None else np.searchsorted(frequency, f_max, side="right")
+        return frequency[lo:hi], data[:, lo:hi]
+
+    def read(self, start=None, stop=None, cal_id: str = None, f_min=None, f_max=None):
+        """Yield (record, frequency, data) of every matching sweep, see query() and sweep()"""
+        index = self.index()
+        for position in self.query(start, stop, cal_id, f_min, f_max):
+            record = index[position]
+            frequency, data = self._sweep(record, f_min, f_max)
+            yield record, frequency, data
@@ -0,0 +1,103 @@
+"""Streaming averaging of repeated standard measurements.
+
+Repeats are folded in one at a time with Welford's algorithm, so memory stays
+at a mean and a sum of squared deviations per frequency point regardless of
+the number of repeats. For complex sweeps the variance is E|x - mean|^2.
+"""
+import numpy as np
+
+from .two_port import TwoPortCalibration
+from .utils import STANDARD_KEYS
+
+
+class SweepAccumulator:
+    """Running per-point mean and variance of repeated sweeps"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = None
+        self._m2 = None
+
+    def add(self, sweep):
+        x = np.asarray(sweep)
+        if self.mean is None:
+            self.mean = np.zeros(x.shape, dtype=np.result_type(x, float))
+            self._m2 = np.zeros(x.shape, dtype=float)
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        # m2 += conj(x - old mean) * (x - new mean), real for complex data
+        delta = np.conj(delta)
+        delta *= x - self.mean
+        self._m2 += delta.real
+
+    def add_batch(self, sweeps):
+        """Fold in a stack of sweeps along the first axis at once (Chan et al. merge)"""
+        sweeps = np.asarray(sweeps)
+        other = SweepAccumulator()
+        other.count = sweeps.shape[0]
+        other.mean = sweeps.mean(axis=0)
+        deviation = sweeps - other.mean
+        other._m2 = (deviation.real ** 2).sum(axis=0)
+        if np.iscomplexobj(deviation):
+            other._m2 += (deviation.imag ** 2).sum(axis=0)
+        self.merge(other)
+
+    def merge(self, other: "SweepAccumulator"):
+        """Combine with an accumulator of other repeats of the same sweep"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count = other.count
+            self.mean = np.array(other.mean, dtype=np.result_type(other.mean, float))
+            self._m2 = np.array(other._m2, dtype=float)
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * (other.count / count)
+        self._m2 += other._m2 + np.abs(delta) ** 2 * (self.count * other.count / count)
+        self.count = count
+
+    def variance(self, ddof: int = 1):
+        """Per-point variance of a single repeat"""
+        assert self.count > ddof, "Not enough repeats for the variance"
+        return self._m2 / (self.count - ddof)
+
+    def std_error(self):
+        """Per-point standard error of the mean"""
+        return np.sqrt(self.variance() / self.count)
+
+
+class StandardsAccumulator:
+    """One SweepAccumulator per two port standard (keys as in ``load_two_port_cals``)"""
+
+    def __init__(self):
+        self.accumulators = {key: SweepAccumulator() for key in STANDARD_KEYS}
+
+    def add(self, key: str, sweep):
+        """Fold in one repeat of standard ``key``, e.g. ``add("throw_sm21", sweep)``"""
+        self.accumulators[key].add(sweep)
+
+    def add_standards(self, standards: dict):
+        """Fold in one repeat of several standards at once"""
+        for key, sweep in standards.items():
+            self.add(key, sweep)
+
+    def counts(self) -> dict:
+        return {key: acc.count for key, acc in self.accumulators.items()}
+
+    def means(self) -> dict:
+        return {key: acc.mean for key, acc in self.accumulators.items()}
+
+    def variances(self, ddof: int = 1) -> dict:
+        return {key: acc.variance(ddof) for key, acc in self.accumulators.items()}
+
+    def calibration(self, s11_load=0.01, s11_open=0.99, s11_short=-0.99) -> TwoPortCalibration:
+        """Solved TwoPortCalibration of the averaged standards"""
+        missing = [key for key, count in self.counts().items() if count == 0]
+        assert not missing, f"No repeats for {', '.join(missing)}"
+        cal = TwoPortCalibration(
+            **self.means(), s11_load=s11_load, s11_open=s11_open, s11_short=s11_short
+        )
+        cal.calibrate()
+        return cal
@@ -0,0 +1,108 @@
+"""Persistent on-disk cache of solved two port calibrations.
+
+Entries are keyed by a hash of the standard files' contents and the ideal
+standard values, so any change of an input produces a new key and the stale
+entry is never hit again; it ages out through LRU eviction.
+"""
+import hashlib
+import os
+import shutil
+import uuid
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .storage import load_cals, load_standards, save_cals, save_standards
+
+
+class CalibrationCache:
+    """Directory of cached ``<key>/standards.npy`` + ``<key>/cals.npy`` entries"""
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        """
+        :param directory - Cache directory, created if missing
+        :param max_bytes - Total size limit, least recently used entries are evicted above it
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(paths: dict, s11_load, s11_open, s11_short) -> str:
+        """Hash of the standard files (``{key: path}``) and the ideal reflections"""
+        h = hashlib.sha256()
+        for name in sorted(paths):
+            h.update(name.encode())
+            with open(paths[name], "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    h.update(block)
+        for value in (s11_load, s11_open, s11_short):
+            value = np.asarray(value, dtype=complex)
+            h.update(repr(value.shape).encode())
+            h.update(value.tobytes())
+        return h.hexdigest()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[Tuple[dict, dict]]:
+        """Memory mapped (standards, cals) for ``key`` or None on a miss"""
+        entry = self._entry(key)
+        try:
+            standards = load_standards(os.path.join(entry, "standards.npy"))
+            cals = load_cals(os.path.join(entry, "cals.npy"))
+        except (FileNotFoundError, ValueError):
+            return None
+        os.utime(entry)
+        return standards, cals
+
+    def put(self, key: str, standards: dict, cals: dict):
+        entry = self._entry(key)
+        tmp = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+        try:
+            save_standards(os.path.join(tmp, "standards.npy"), standards)
+            save_cals(os.path.join(tmp, "cals.npy"), cals)
+            os.rename(tmp, entry)
+        except OSError:
+            # another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not os.path.isdir(entry):
+                raise
+        self.evict()
+
+    def invalidate(self, key: str):
+        shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def clear(self):
+        for key, _, _ in self.entries():
+            self.invalidate(key)
+
+    def entries(self):
+        """(key, last use time, size in bytes) of every entry, least recently used first"""
+        result = []
+        for key in os.listdir(self.directory):
+            entry = self._entry(key)
+            if key.startswith(".") or not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry)
+                )
+                result.append((key, os.path.getmtime(entry), size))
+            except FileNotFoundError:
+                continue
+        return sorted(result, key=lambda e: e[1])
+
+    def size(self) -> int:
+        return sum(size for _, _, size in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits ``max_bytes``"""
+        entries = self.entries()
+        total = sum(size for _, _, size in entries)
+        for key, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            self.invalidate(key)
+            total -= size
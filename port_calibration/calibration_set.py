@@ -0,0 +1,57 @@
+from typing import List
+
+import numpy as np
+
+from .two_port import TwoPortCalibration
+from .utils import STANDARD_KEYS
+
+
+class CalibrationSet:
+    """Two port calibrations of many receiver channels.
+
+    Standards of all channels are stacked into (channels, frequencies) arrays and
+    solved as one batched computation over the channel axis, corrections are
+    applied to stacked measurements in a single call.
+    """
+
+    def __init__(self, standards: dict, s11_load=0.01, s11_open=0.99, s11_short=-0.99):
+        """
+        :param standards - The 12 standards (keys as in ``load_two_port_cals``),
+            each of shape (channels, frequencies)
+        :param s11_load, s11_open, s11_short - Ideal reflections, scalars or
+            arrays broadcastable to (channels, frequencies)
+        """
+        self.standards = {key: np.asarray(standards[key]) for key in STANDARD_KEYS}
+        shape = self.standards["load_sm11"].shape
+        assert len(shape) == 2, "Standards should be (channels, frequencies) arrays"
+        for key, value in self.standards.items():
+            assert value.shape == shape, f"{key} has shape {value.shape}, expected {shape}"
+        self.calibration = TwoPortCalibration(
+            **self.standards, s11_load=s11_load, s11_open=s11_open, s11_short=s11_short
+        )
+
+    @classmethod
+    def from_channels(cls, channels: List[dict], **kwargs) -> "CalibrationSet":
+        """Stack per-channel standards dicts (e.g. from ``load_two_port_standards``)"""
+        standards = {
+            key: np.stack([channel[key] for channel in channels]) for key in STANDARD_KEYS
+        }
+        return cls(standards, **kwargs)
+
+    def __len__(self):
+        return self.standards["load_sm11"].shape[0]
+
+    def calibrate(self):
+        self.calibration.calibrate()
+
+    def cals(self) -> dict:
+        """Stacked error terms, each (channels, frequencies)"""
+        return self.calibration.cals()
+
+    def channel(self, i: int) -> TwoPortCalibration:
+        """Correction-ready calibration of a single channel"""
+        return TwoPortCalibration.from_cals({k: v[i] for k, v in self.cals().items()})
+
+    def correct(self, sm11, sm22, sm12, sm21, out=None):
+        """Corrected (S11, S22, S12, S21) of stacked (channels, frequencies) measurements"""
+        return self.calibration.correct(sm11, sm22, sm12, sm21, out=out)
@@ -0,0 +1,208 @@
+"""``port-cal`` command line tool.
+
+    port-cal solve --open o/ --short s/ --load l/ --through t/ -o cals.npy
+    port-cal correct --cals cals.npy measurements/ [-o corrected/] [--workers 8]
+
+A DUT measurement is either a ``.s2p`` file or a directory holding
+``s11.json``, ``s22.json``, ``s12.json`` and ``s21.json``. Corrected results
+are written in the same format, next to the input (``name.corrected.s2p`` or
+``<dir>/corrected/``) or mirrored into the output directory.
+Subcommands import their dependencies lazily to keep startup short.
+"""
+import argparse
+import os
+import sys
+import time
+
+CORRECTED_SUFFIX = ".corrected.s2p"
+CORRECTED_DIR = "corrected"
+JSON_PARAMS = ("s11", "s22", "s12", "s21")
+
+_worker_calibration = None
+
+
+def _add_standards_args(parser, required: bool):
+    for name in ("open", "short", "load", "through"):
+        parser.add_argument(f"--{name}", required=required, help=f"{name} standard directory")
+    parser.add_argument("--s11-load", type=complex, default=0.01)
+    parser.add_argument("--s11-open", type=complex, default=0.99)
+    parser.add_argument("--s11-short", type=complex, default=-0.99)
+    parser.add_argument(
+        "--load-workers", type=int, default=None, help="threads for reading the standard files"
+    )
+
+
+def _solve(args):
+    from .utils import load_two_port_cals
+
+    cal, _ = load_two_port_cals(
+        args.open,
+        args.short,
+        args.load,
+        args.through,
+        s11_load=args.s11_load,
+        s11_open=args.s11_open,
+        s11_short=args.s11_short,
+        workers=args.load_workers,
+    )
+    return cal
+
+
+def cmd_solve(args):
+    from .storage import save_cals
+
+    start = time.perf_counter()
+    cal = _solve(args)
+    save_cals(args.output, cal)
+    elapsed = time.perf_counter() - start
+    print(f"Solved {len(cal.e00)} points in {elapsed:.2f} s -> {args.output}")
+    return 0
+
+
+def find_measurements(root: str):
+    """``.s2p`` files and JSON measurement directories below ``root``"""
+    found = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d != CORRECTED_DIR)
+        if all(f"{p}.json" in filenames for p in JSON_PARAMS):
+            found.append(directory)
+        for filename in sorted(filenames):
+            if filename.lower().endswith(".s2p") and not filename.endswith(CORRECTED_SUFFIX):
+                found.append(os.path.join(directory, filename))
+    return found
+
+
+def _output_path(path: str, root: str, output_dir):
+    if output_dir is None:
+        if os.path.isdir(path):
+            return os.path.join(path, CORRECTED_DIR)
+        return path[: -len(".s2p")] + CORRECTED_SUFFIX
+    return os.path.join(output_dir, os.path.relpath(path, root))
+
+
+def _write_json(directory: str, results: dict):
+    import json
+
+    os.makedirs(directory, exist_ok=True)
+    for name, value in results.items():
+        data = {"real": value.real.tolist(), "imag": value.imag.tolist()}
+        with open(os.path.join(directory, f"{name}.json"), "w") as f:
+            json.dump({"data": data}, f)
+
+
+def correct_file(cal, path: str, output: str) -> int:
+    """Correct one measurement with ``cal``, returns the number of points"""
+    if os.path.isdir(path):
+        from .utils import load_json_sweep
+
+        corrected = cal.correct_sweep(load_json_sweep(path, JSON_PARAMS))
+        _write_json(output, {p: getattr(corrected, p) for p in JSON_PARAMS})
+        return len(corrected)
+
+    from .touchstone import read_sweep, write_sweep
+
+    corrected = cal.correct_sweep(read_sweep(path))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    write_sweep(output, corrected)
+    return len(corrected)
+
+
+def _init_worker(cals_path: str):
+    global _worker_calibration
+    from .storage import load_cals
+    from .two_port import TwoPortCalibration
+
+    _worker_calibration = TwoPortCalibration.from_cals(load_cals(cals_path))
+
+
+def _correct_in_worker(path: str, output: str) -> int:
+    return correct_file(_worker_calibration, path, output)
+
+
+def cmd_correct(args):
+    import tempfile
+
+    from .storage import save_cals
+
+    paths = find_measurements(args.input)
+    if not paths:
+        print(f"No measurements found in {args.input}", file=sys.stderr)
+        return 1
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        cals_path = args.cals
+        if cals_path is None:
+            cals_path = os.path.join(tmp, "cals.npy")
+            save_cals(cals_path, _solve(args))
+        jobs = [(path, _output_path(path, args.input, args.output)) for path in paths]
+
+        points, failures = 0, []
+        if args.workers == 1:
+            _init_worker(cals_path)
+            for path, output in jobs:
+                try:
+                    points += _correct_in_worker(path, output)
+                except Exception as exc:
+                    failures.append((path, exc))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(
+                max_workers=args.workers, initializer=_init_worker, initargs=(cals_path,)
+            ) as pool:
+                futures = [
+                    (path, pool.submit(_correct_in_worker, path, output))
+                    for path, output in jobs
+                ]
+                for path, future in futures:
+                    try:
+                        points += future.result()
+                    except Exception as exc:
+                        failures.append((path, exc))
+
+    elapsed = time.perf_counter() - start
+    done = len(jobs) - len(failures)
+    print(
+        f"Corrected {done} of {len(jobs)} measurements ({points} points) in {elapsed:.2f} s: "
+        f"{done / elapsed:.1f} files/s, {points / elapsed:.3g} points/s"
+    )
+    for path, exc in failures:
+        print(f"FAILED {path}: {type(exc).__name__}: {exc}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="port-cal", description="Two port TOSL calibration")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    solve = sub.add_parser("solve", help="solve error terms from standard directories")
+    _add_standards_args(solve, required=True)
+    solve.add_argument("-o", "--output", required=True, help="error terms .npy file")
+    solve.set_defaults(func=cmd_solve)
+
+    correct = sub.add_parser("correct", help="correct a directory tree of DUT measurements")
+    correct.add_argument("input", help="measurement directory")
+    correct.add_argument("-o", "--output", help="output directory, next to inputs by default")
+    correct.add_argument("--cals", help="error terms from 'port-cal solve'")
+    correct.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="worker processes, 1 corrects in-process",
+    )
+    _add_standards_args(correct, required=False)
+    correct.set_defaults(func=cmd_correct)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "correct" and args.cals is None:
+        if any(getattr(args, n) is None for n in ("open", "short", "load", "through")):
+            build_parser().error("--cals or all of --open/--short/--load/--through required")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Drift check of stored error terms against one re-measured standard.
+
+The stored calibration predicts what a known standard should read; the
+largest deviation of the fresh measurement from that prediction, per
+frequency point, is compared against a threshold per band. A passing check
+means the error terms still hold and a full TOSL run can be skipped::
+
+    thru = {"sm11": ..., "sm22": ..., "sm12": ..., "sm21": ...}  # fresh thru sweep
+    report = check_two_port(
+        cal, thru, frequency=f, bands=[(1e9, 6e9), (6e9, 12e9)], thresholds=[0.01, 0.02]
+    )
+    if not report.passed:
+        recalibrate()
+"""
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Ideal flush thru, the default standard of check_two_port
+THRU = {"s11": 0, "s22": 0, "s12": 1, "s21": 1}
+
+
+@dataclass(frozen=True)
+class DriftReport:
+    residual: np.ndarray  # (N,) largest |measured - predicted| over the parameters
+    bands: Tuple[Tuple[float, float], ...]
+    thresholds: np.ndarray  # per band
+    max_residual: np.ndarray  # per band, nan for bands without points
+    band_passed: np.ndarray  # per band
+
+    @property
+    def passed(self) -> bool:
+        return bool(self.band_passed.all())
+
+    def failed_bands(self):
+        return [band for band, ok in zip(self.bands, self.band_passed) if not ok]
+
+
+def check_drift(
+    predicted: Sequence,
+    measured: Sequence,
+    frequency=None,
+    bands=None,
+    thresholds=0.01,
+) -> DriftReport:
+    """Per band pass/fail of the deviation between measured and predicted parameters.
+
+    :param predicted, measured - Sequences of (N,) arrays, one per S-parameter
+    :param frequency - Frequency axis, sorted; band edges are indices into the sweep if None
+    :param bands - (start, stop) pairs, inclusive; one band over the whole sweep by default
+    :param thresholds - Largest allowed |measured - predicted|, scalar or one per band
+    """
+    residual = None
+    for p, m in zip(predicted, measured):
+        r = np.abs(np.asarray(m) - p)
+        residual = r if residual is None else np.maximum(residual, r, out=residual)
+    residual = np.atleast_1d(residual)
+    axis = np.arange(len(residual)) if frequency is None else np.asarray(frequency)
+    assert axis.shape == residual.shape, "Frequency axis must match the measurement"
+    if bands is None:
+        bands = [(axis[0], axis[-1])]
+    bands = tuple((float(start), float(stop)) for start, stop in bands)
+    thresholds = np.broadcast_to(np.asarray(thresholds, dtype=float), (len(bands),))
+
+    starts = np.searchsorted(axis, [start for start, _ in bands], side="left")
+    stops = np.searchsorted(axis, [stop for _, stop in bands], side="right")
+    max_residual = np.array(
+        [residual[lo:hi].max() if hi > lo else np.nan for lo, hi in zip(starts, stops)]
+    )
+    # bands without points cannot show drift
+    band_passed = ~(max_residual > thresholds)
+    return DriftReport(residual, bands, thresholds, max_residual, band_passed)
+
+
+def check_one_port(cal, sm11, s11=0, frequency=None, bands=None, thresholds=0.01) -> DriftReport:
+    """Drift check of a solved OnePortCalibration with a re-measured standard.
+
+    :param sm11 - Fresh raw reading of the standard
+    :param s11 - Its actual reflection, a load by default; scalar or per point
+    """
+    return check_drift((cal.predict(s11),), (sm11,), frequency, bands, thresholds)
+
+
+def check_two_port(
+    cal, measured: dict, standard: dict = None, frequency=None, bands=None, thresholds=0.01
+) -> DriftReport:
+    """Drift check of a solved TwoPortCalibration with a re-measured two port standard.
+
+    :param measured - Fresh raw readings with keys sm11, sm22, sm12, sm21
+    :param standard - Actual s11, s22, s12, s21 of the standard, an ideal thru by default
+    """
+    standard = THRU if standard is None else standard
+    predicted = cal.predict(standard["s11"], standard["s22"], standard["s12"], standard["s21"])
+    keys = ("sm11", "sm22", "sm12", "sm21")
+    return check_drift(predicted, [measured[key] for key in keys], frequency, bands, thresholds)
@@ -0,0 +1,156 @@
+"""Opt-in timing and memory instrumentation of the calibration pipeline.
+
+Loading, every TOSL step, the one port solve and corrections run inside named
+spans. While disabled (the default) ``span()`` returns a shared no-op object,
+so the cost is one function call per span::
+
+    from port_calibration import instrumentation
+    instrumentation.enable(track_memory=True)
+    load_two_port_cals(...)
+    instrumentation.stats()  # {"two_port.step_1": {"count": 1, "total_time": ...}, ...}
+
+tracemalloc peaks are process wide, so memory is only tracked for spans on the
+main thread and their peaks include allocations other threads make meanwhile.
+Spans in worker threads, e.g. corrections in a CorrectionService executor,
+record time and points with ``peak_bytes`` None.
+"""
+import threading
+import time
+import tracemalloc
+
+_enabled = False
+_track_memory = False
+_started_tracemalloc = False
+_stats = {}
+_callbacks = []
+_lock = threading.Lock()
+_local = threading.local()
+
+
+class _NullSpan:
+    points = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, name: str, points):
+        self.name = name
+        self.points = points
+        self.child_peak = 0
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault("stack", [])
+        # decided once, enable() or disable() while the span is open do not change it
+        self.track_memory = (
+            _track_memory and threading.current_thread() is threading.main_thread()
+        )
+        if self.track_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            tracemalloc.reset_peak()
+            self.start_memory = current
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        stack = _local.stack
+        stack.pop()
+        peak_bytes = None
+        if self.track_memory and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_peak)
+            peak_bytes = peak - self.start_memory
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+        _record(self.name, elapsed, self.points, peak_bytes)
+        return False
+
+
+def _record(name: str, elapsed: float, points, peak_bytes):
+    with _lock:
+        entry = _stats.get(name)
+        if entry is None:
+            entry = _stats[name] = {
+                "count": 0,
+                "total_time": 0.0,
+                "max_time": 0.0,
+                "points": 0,
+                "peak_bytes": None,
+            }
+        entry["count"] += 1
+        entry["total_time"] += elapsed
+        entry["max_time"] = max(entry["max_time"], elapsed)
+        if points:
+            entry["points"] += int(points)
+        if peak_bytes is not None:
+            entry["peak_bytes"] = max(entry["peak_bytes"] or 0, peak_bytes)
+    for callback in list(_callbacks):
+        callback(
+            {"name": name, "time": elapsed, "points": points, "peak_bytes": peak_bytes}
+        )
+
+
+def span(name: str, points=None):
+    """Context manager timing the enclosed block under ``name``.
+
+    :param points - Number of frequency points handled, may also be set on the span later
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, points)
+
+
+def enable(track_memory: bool = False):
+    """Start recording spans, ``track_memory`` also records peak allocation via tracemalloc"""
+    global _enabled, _track_memory, _started_tracemalloc
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+    _track_memory = track_memory
+    _enabled = True
+
+
+def disable():
+    global _enabled, _track_memory, _started_tracemalloc
+    _enabled = False
+    _track_memory = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def stats() -> dict:
+    """Aggregated spans: name -> count, total_time, max_time, points, peak_bytes"""
+    with _lock:
+        return {name: dict(entry) for name, entry in _stats.items()}
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def add_callback(callback):
+    """Call ``callback(record)`` after every finished span, record has name, time, points, peak_bytes"""
+    _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    _callbacks.remove(callback)
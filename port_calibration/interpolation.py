@@ -0,0 +1,108 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from .storage import CALS_KEYS
+from .two_port import TwoPortCalibration
+
+
+class FrequencyCalibration:
+    """Two port error terms on a calibration frequency axis, interpolated onto other grids.
+
+    Search indices and weights are cached per target grid, so repeated
+    interpolation onto the same grid is a single multiply-add over all 12 terms.
+    The precomputed calibrations of the ``max_calibrations`` most recent grids are
+    cached as well, so repeated correct() calls on one grid reuse their correction
+    coefficients. Each holds the error terms and derived coefficients of its grid,
+    about 300 bytes per point in complex128 (0.3 GB for a 1M point grid), which is
+    why this cache is kept smaller than the weight cache.
+    Points outside the calibration axis take the value of the nearest edge.
+    """
+
+    def __init__(
+        self,
+        cal,
+        frequency,
+        method: str = "linear",
+        cache_size: int = 8,
+        max_calibrations: int = 2,
+    ):
+        """
+        :param cal - Solved TwoPortCalibration or its cals() dict
+        :param frequency - Calibration frequency axis, strictly increasing
+        :param method - "linear" on real/imag or "magphase" on magnitude and unwrapped phase
+        :param cache_size - Number of target grids whose weights are kept
+        :param max_calibrations - Number of target grids whose calibrations are kept
+        """
+        assert method in ("linear", "magphase"), f"Unknown interpolation method {method}"
+        if isinstance(cal, TwoPortCalibration):
+            cal = cal.cals()
+        self.frequency = np.asarray(frequency, dtype=float)
+        n = len(self.frequency)
+        assert n >= 2, "At least two calibration points are needed"
+        assert np.all(np.diff(self.frequency) > 0), "Frequency axis must be increasing"
+        self.method = method
+        self.cache_size = cache_size
+        self.max_calibrations = max_calibrations
+
+        terms = np.stack(
+            [np.broadcast_to(np.asarray(cal[key], dtype=complex), (n,)) for key in CALS_KEYS]
+        )
+        if method == "linear":
+            self._nodes = (terms,)
+        else:
+            self._nodes = (np.abs(terms), np.unwrap(np.angle(terms), axis=-1))
+        self._slopes = tuple(np.diff(node, axis=-1) for node in self._nodes)
+        self._weights = OrderedDict()
+        self._calibrations = OrderedDict()
+
+    def weights(self, frequency):
+        """Cached (indices, weights) of ``frequency`` on the calibration axis"""
+        frequency = np.ascontiguousarray(frequency, dtype=float)
+        key = frequency.tobytes()
+        cached = self._weights.get(key)
+        if cached is not None:
+            self._weights.move_to_end(key)
+            return cached
+
+        idx = np.searchsorted(self.frequency, frequency, side="right") - 1
+        np.clip(idx, 0, len(self.frequency) - 2, out=idx)
+        f0 = self.frequency[idx]
+        w = (frequency - f0) / (self.frequency[idx + 1] - f0)
+        np.clip(w, 0, 1, out=w)
+
+        self._weights[key] = idx, w
+        if len(self._weights) > self.cache_size:
+            self._weights.popitem(last=False)
+        return idx, w
+
+    def interpolate(self, frequency) -> dict:
+        """Error terms on ``frequency`` as a cals() dict"""
+        idx, w = self.weights(frequency)
+        values = [node[:, idx] + w * slope[:, idx] for node, slope in zip(self._nodes, self._slopes)]
+        if self.method == "linear":
+            terms = values[0]
+        else:
+            terms = values[0] * np.exp(1j * values[1])
+        return dict(zip(CALS_KEYS, terms))
+
+    def calibration(self, frequency) -> TwoPortCalibration:
+        """Cached TwoPortCalibration with error terms on ``frequency``, ready for correct()"""
+        key = np.ascontiguousarray(frequency, dtype=float).tobytes()
+        cal = self._calibrations.get(key)
+        if cal is not None:
+            self._calibrations.move_to_end(key)
+            return cal
+
+        cal = TwoPortCalibration.from_cals(self.interpolate(frequency))
+        if self.max_calibrations > 0:
+            self._calibrations[key] = cal
+            if len(self._calibrations) > self.max_calibrations:
+                self._calibrations.popitem(last=False)
+        return cal
+
+    def correct(self, frequency, sm11, sm22, sm12, sm21, out=None, workspace=None):
+        """Corrected (S11, S22, S12, S21) of a measurement taken on ``frequency``"""
+        return self.calibration(frequency).correct(
+            sm11, sm22, sm12, sm21, out=out, workspace=workspace
+        )
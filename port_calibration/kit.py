@@ -0,0 +1,135 @@
+"""Frequency dependent calibration kit models.
+
+Standards follow the usual VNA kit definition: an offset transmission line
+(delay, loss, impedance) terminated by an open with polynomial capacitance,
+a short with polynomial inductance or a (non ideal) load. All values are SI:
+C0 [F], C1 [F/Hz], C2 [F/Hz^2], C3 [F/Hz^3], L0 [H], ..., delay [s], loss [Ohm/s].
+Kit files usually list C0 in 1e-15 F, C1 in 1e-27 F/Hz, L0 in 1e-12 H and so on.
+
+``CalibrationKit.evaluate(frequency)`` returns per-point ideal reflections that
+OnePortCalibration / TwoPortCalibration accept in place of the scalar defaults::
+
+    cal = TwoPortCalibration(**standards, **kit.evaluate(frequency))
+"""
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Offset:
+    delay: float = 0.0
+    loss: float = 0.0
+    z0: float = 50.0
+
+
+@dataclass(frozen=True)
+class OpenStandard:
+    c0: float = 0.0
+    c1: float = 0.0
+    c2: float = 0.0
+    c3: float = 0.0
+    offset: Offset = field(default_factory=Offset)
+
+    def terminal_admittance(self, frequency):
+        f = frequency
+        c = self.c0 + f * (self.c1 + f * (self.c2 + f * self.c3))
+        return 2j * np.pi * f * c
+
+
+@dataclass(frozen=True)
+class ShortStandard:
+    l0: float = 0.0
+    l1: float = 0.0
+    l2: float = 0.0
+    l3: float = 0.0
+    offset: Offset = field(default_factory=Offset)
+
+    def terminal_impedance(self, frequency):
+        f = frequency
+        inductance = self.l0 + f * (self.l1 + f * (self.l2 + f * self.l3))
+        return 2j * np.pi * f * inductance
+
+
+@dataclass(frozen=True)
+class LoadStandard:
+    resistance: float = 50.0
+    inductance: float = 0.0
+    offset: Offset = field(default_factory=Offset)
+
+    def terminal_impedance(self, frequency):
+        return self.resistance + 2j * np.pi * frequency * self.inductance
+
+
+class _OffsetLine:
+    """Offset line of a standard evaluated on a frequency grid"""
+
+    def __init__(self, frequency, offset: Offset):
+        f = frequency
+        root_f = np.sqrt(f / 1e9)
+        # skin effect term of the line impedance, dropped at DC where it diverges
+        with np.errstate(divide="ignore", invalid="ignore"):
+            skin = np.where(f > 0, offset.loss / (4 * np.pi * f) * root_f, 0.0)
+        self.zc = offset.z0 + (1 - 1j) * skin
+        self.gamma_l = 2j * np.pi * f * offset.delay + (1 + 1j) * (
+            offset.loss * offset.delay / (2 * offset.z0) * root_f
+        )
+
+    def reflection(self, gamma_t, z0: float):
+        """Reflection referenced to ``z0`` of a termination with reflection
+        ``gamma_t`` (referenced to the line impedance) at the end of the line"""
+        gamma_c = gamma_t * np.exp(-2 * self.gamma_l)
+        # Zin = zc * (1 + gamma_c) / (1 - gamma_c), written without the division
+        num = self.zc * (1 + gamma_c)
+        den = 1 - gamma_c
+        return (num - z0 * den) / (num + z0 * den)
+
+
+# (kit, frequency grid hash) -> evaluated standards
+_CACHE = OrderedDict()
+_CACHE_SIZE = 32
+
+
+@dataclass(frozen=True)
+class CalibrationKit:
+    open: OpenStandard = field(default_factory=OpenStandard)
+    short: ShortStandard = field(default_factory=ShortStandard)
+    load: LoadStandard = field(default_factory=LoadStandard)
+    z0: float = 50.0
+
+    def _evaluate(self, f):
+        line = _OffsetLine(f, self.open.offset)
+        zy = line.zc * self.open.terminal_admittance(f)
+        s11_open = line.reflection((1 - zy) / (1 + zy), self.z0)
+
+        line = _OffsetLine(f, self.short.offset)
+        z = self.short.terminal_impedance(f)
+        s11_short = line.reflection((z - line.zc) / (z + line.zc), self.z0)
+
+        line = _OffsetLine(f, self.load.offset)
+        z = self.load.terminal_impedance(f)
+        s11_load = line.reflection((z - line.zc) / (z + line.zc), self.z0)
+
+        return {"s11_open": s11_open, "s11_short": s11_short, "s11_load": s11_load}
+
+    def evaluate(self, frequency) -> dict:
+        """Ideal s11_open / s11_short / s11_load arrays on ``frequency`` [Hz].
+
+        Results are cached per (kit, frequency grid) and returned read-only.
+        """
+        f = np.ascontiguousarray(frequency, dtype=float)
+        key = (self, hashlib.sha1(f.tobytes()).hexdigest(), f.shape)
+        cached = _CACHE.get(key)
+        if cached is not None:
+            _CACHE.move_to_end(key)
+            return cached
+
+        result = self._evaluate(f)
+        for value in result.values():
+            value.flags.writeable = False
+        _CACHE[key] = result
+        if len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+        return result
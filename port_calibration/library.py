@@ -0,0 +1,177 @@
+"""Library of solved calibrations indexed by operating point.
+
+Each entry carries an operating point of arbitrary numeric keys, e.g.
+``{"lo_ghz": 230, "bias_mv": 2.1, "temperature_k": 4.2}``, and either stored
+error terms (``<id>.npy``) or the four standard directories to solve from.
+Only ``index.json`` is read up front; error terms are loaded (memory mapped)
+or solved on first use and kept in a bounded LRU::
+
+    library = CalibrationLibrary("cals/", scales={"lo_ghz": 1, "bias_mv": 0.1})
+    library.add({"lo_ghz": 230, "bias_mv": 2.1}, cal)
+    entry, cal = library.nearest({"lo_ghz": 231, "bias_mv": 2.0})
+"""
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+from .storage import load_cals, save_cals
+from .two_port import TwoPortCalibration
+from .utils import load_two_port_cals
+
+
+class CalibrationLibrary:
+    """Directory of calibrations with an ``index.json`` of their operating points"""
+
+    def __init__(self, directory: str, max_loaded: int = 8, scales: dict = None, cache=None):
+        """
+        :param directory - Library directory, created if missing
+        :param max_loaded - Number of calibrations kept in memory
+        :param scales - Per key distance scale for nearest(), 1 for keys not listed
+        :param cache - CalibrationCache used when solving entries added from standards
+        """
+        self.directory = directory
+        self.max_loaded = max_loaded
+        self.scales = dict(scales or {})
+        self.cache = cache
+        os.makedirs(directory, exist_ok=True)
+        self._index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self._loaded = OrderedDict()
+        self._entries = {}
+        if os.path.exists(self._index_path):
+            with open(self._index_path) as f:
+                self._entries = {entry["id"]: entry for entry in json.load(f)}
+        self._build_points()
+
+    def _build_points(self):
+        self._ids = list(self._entries)
+        self._keys = sorted({key for entry in self._entries.values() for key in entry["point"]})
+        self._points = np.full((len(self._ids), len(self._keys)), np.nan)
+        for row, entry_id in enumerate(self._ids):
+            for key, value in self._entries[entry_id]["point"].items():
+                self._points[row, self._keys.index(key)] = value
+
+    def _write_index(self):
+        tmp = f"{self._index_path}.tmp-{uuid.uuid4().hex}"
+        with open(tmp, "w") as f:
+            json.dump(list(self._entries.values()), f, indent=1)
+        os.replace(tmp, self._index_path)
+        self._build_points()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> list:
+        """Index entries: id, point and either cals (file name) or standards (directories)"""
+        return [dict(entry) for entry in self._entries.values()]
+
+    def _add(self, entry: dict) -> str:
+        with self._lock:
+            self._entries[entry["id"]] = entry
+            self._loaded.pop(entry["id"], None)
+            self._write_index()
+        return entry["id"]
+
+    def add(self, point: dict, cal, entry_id: str = None) -> str:
+        """Store solved error terms (TwoPortCalibration or cals() dict) at ``point``"""
+        entry_id = entry_id or uuid.uuid4().hex
+        filename = f"{entry_id}.npy"
+        save_cals(os.path.join(self.directory, filename), cal)
+        point = {key: float(value) for key, value in point.items()}
+        return self._add({"id": entry_id, "point": point, "cals": filename})
+
+    def add_standards(
+        self,
+        point: dict,
+        open_dir: str,
+        short_dir: str,
+        load_dir: str,
+        through_dir: str,
+        s11_load=0.01,
+        s11_open=0.99,
+        s11_short=-0.99,
+        entry_id: str = None,
+    ) -> str:
+        """Register standard directories at ``point``, solved on first use"""
+        entry_id = entry_id or uuid.uuid4().hex
+        point = {key: float(value) for key, value in point.items()}
+        ideal = [complex(v) for v in (s11_load, s11_open, s11_short)]
+        standards = {
+            "dirs": [open_dir, short_dir, load_dir, through_dir],
+            "ideal": [[v.real, v.imag] for v in ideal],
+        }
+        return self._add({"id": entry_id, "point": point, "standards": standards})
+
+    def remove(self, entry_id: str):
+        with self._lock:
+            entry = self._entries.pop(entry_id)
+            self._loaded.pop(entry_id, None)
+            self._write_index()
+        if "cals" in entry:
+            os.remove(os.path.join(self.directory, entry["cals"]))
+
+    def _load(self, entry: dict) -> TwoPortCalibration:
+        if "cals" in entry:
+            return TwoPortCalibration.from_cals(
+                load_cals(os.path.join(self.directory, entry["cals"]))
+            )
+        s11_load, s11_open, s11_short = (complex(*v) for v in entry["standards"]["ideal"])
+        cal, _ = load_two_port_cals(
+            *entry["standards"]["dirs"],
+            s11_load=s11_load,
+            s11_open=s11_open,
+            s11_short=s11_short,
+            cache=self.cache,
+        )
+        return cal
+
+    def calibration(self, entry_id: str) -> TwoPortCalibration:
+        """Calibration of an entry, loaded on first use and kept in the LRU"""
+        with self._lock:
+            cal = self._loaded.get(entry_id)
+            if cal is not None:
+                self._loaded.move_to_end(entry_id)
+                return cal
+            entry = self._entries[entry_id]
+        cal = self._load(entry)
+        with self._lock:
+            self._loaded[entry_id] = cal
+            self._loaded.move_to_end(entry_id)
+            while len(self._loaded) > self.max_loaded:
+                self._loaded.popitem(last=False)
+        return cal
+
+    def loaded(self) -> list:
+        """Ids of the calibrations in memory, least recently used first"""
+        with self._lock:
+            return list(self._loaded)
+
+    def distances(self, point: dict) -> np.ndarray:
+        """Scaled euclidean distance of every entry to ``point`` over the keys of ``point``,
+        inf for entries without one of them"""
+        missing = [key for key in point if key not in self._keys]
+        if missing or not self._ids:
+            return np.full(len(self._ids), np.inf)
+        columns = [self._keys.index(key) for key in point]
+        target = np.array([float(value) for value in point.values()])
+        scales = np.array([self.scales.get(key, 1.0) for key in point])
+        diff = (self._points[:, columns] - target) / scales
+        distance = np.sqrt((diff * diff).sum(axis=1))
+        distance[np.isnan(distance)] = np.inf
+        return distance
+
+    def nearest(
+        self, point: dict, max_distance: float = np.inf
+    ) -> Tuple[dict, TwoPortCalibration]:
+        """(entry, calibration) closest to ``point``, KeyError if none is within max_distance"""
+        distance = self.distances(point)
+        best = int(np.argmin(distance)) if len(distance) else None
+        if best is None or not np.isfinite(distance[best]) or distance[best] > max_distance:
+            raise KeyError(f"No calibration within {max_distance} of {point}")
+        entry_id = self._ids[best]
+        return dict(self._entries[entry_id]), self.calibration(entry_id)
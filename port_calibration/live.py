@@ -0,0 +1,191 @@
+"""Asyncio correction of live VNA sweep streams.
+
+Raw sweeps are taken from an async source into a bounded queue, corrected off
+the event loop in an executor and published to every subscriber queue.
+When the queue is full the ``"block"`` policy applies backpressure to the
+source and ``"drop_oldest"`` discards the oldest waiting sweep. Subscribers
+receive None when the stream ends, also when the source or the correction
+fails; run() then raises that error.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+POLICIES = ("block", "drop_oldest")
+
+
+class RawSweep(NamedTuple):
+    index: int
+    timestamp: float  # time.perf_counter() at acquisition
+    sm11: np.ndarray
+    sm22: np.ndarray
+    sm12: np.ndarray
+    sm21: np.ndarray
+
+
+class CorrectedSweep(NamedTuple):
+    index: int
+    timestamp: float
+    s11: np.ndarray
+    s22: np.ndarray
+    s12: np.ndarray
+    s21: np.ndarray
+    latency: float  # acquisition to publication, seconds
+
+
+class CorrectionService:
+    """Corrects sweeps from an async source with a solved calibration"""
+
+    def __init__(
+        self,
+        calibration,
+        maxsize: int = 8,
+        policy: str = "block",
+        executor=None,
+        history: int = 10000,
+    ):
+        """
+        :param calibration - Object with correct(sm11, sm22, sm12, sm21), e.g. TwoPortCalibration
+        :param maxsize - Capacity of the input queue and of subscriber queues
+        :param policy - "block" or "drop_oldest" when a queue is full
+        :param executor - concurrent.futures executor for the correction, default loop executor
+        :param history - Number of latest per-sweep latencies kept
+        """
+        assert policy in POLICIES, f"Unknown policy {policy}, expected one of {POLICIES}"
+        self.calibration = calibration
+        self.maxsize = maxsize
+        self.policy = policy
+        self.executor = executor
+        self.latencies = deque(maxlen=history)
+        self.dropped = 0
+        self.processed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._subscribers = []
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue receiving CorrectedSweep items, followed by None when the stream ends"""
+        queue = asyncio.Queue(self.maxsize)
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.remove(queue)
+
+    async def _put(self, queue: asyncio.Queue, item):
+        if self.policy == "block":
+            await queue.put(item)
+            return
+        if queue.full():
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(item)
+
+    def _end_nowait(self, queue: asyncio.Queue):
+        """Put the end of stream without waiting, dropping the oldest item when full"""
+        if queue.full():
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(None)
+
+    async def _feed(self, source):
+        async for sweep in source:
+            await self._put(self._queue, sweep)
+        # on failure or cancellation the worker is stopped by run() instead
+        await self._put(self._queue, None)
+
+    def _correct(self, sweep: RawSweep):
+        return self.calibration.correct(sweep.sm11, sweep.sm22, sweep.sm12, sweep.sm21)
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                sweep = await self._queue.get()
+                if sweep is None:
+                    break
+                s11, s22, s12, s21 = await loop.run_in_executor(
+                    self.executor, self._correct, sweep
+                )
+                latency = time.perf_counter() - sweep.timestamp
+                self.latencies.append(latency)
+                self.processed += 1
+                corrected = CorrectedSweep(
+                    sweep.index, sweep.timestamp, s11, s22, s12, s21, latency
+                )
+                for queue in list(self._subscribers):
+                    await self._put(queue, corrected)
+            for queue in list(self._subscribers):
+                await self._put(queue, None)
+        except BaseException:
+            # subscribers must not wait forever for a stream that has failed
+            for queue in list(self._subscribers):
+                self._end_nowait(queue)
+            raise
+
+    async def run(self, source):
+        """Correct every sweep of the async iterable ``source`` until it is exhausted"""
+        self._queue = asyncio.Queue(self.maxsize)
+        tasks = (asyncio.create_task(self._feed(source)), asyncio.create_task(self._work()))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        latencies = np.asarray(self.latencies)
+        result = {"processed": self.processed, "dropped": self.dropped}
+        if latencies.size:
+            result.update(
+                latency_mean=float(latencies.mean()),
+                latency_p50=float(np.percentile(latencies, 50)),
+                latency_p99=float(np.percentile(latencies, 99)),
+                latency_max=float(latencies.max()),
+            )
+        return result
+
+
+class FakeVNA:
+    """In-process sweep producer for testing, yields RawSweep items"""
+
+    def __init__(
+        self,
+        sm11,
+        sm22,
+        sm12,
+        sm21,
+        count: int,
+        interval: float = 0.0,
+        noise: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        :param sm11, sm22, sm12, sm21 - Raw sweep repeated on every acquisition
+        :param count - Number of sweeps
+        :param interval - Seconds between sweeps
+        :param noise - Standard deviation of complex gaussian noise added per sweep
+        """
+        self.sweep = tuple(np.asarray(s) for s in (sm11, sm22, sm12, sm21))
+        self.count = count
+        self.interval = interval
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+    def _noise(self, shape):
+        return self.noise * (
+            self.rng.normal(size=shape) + 1j * self.rng.normal(size=shape)
+        )
+
+    async def __aiter__(self):
+        for index in range(self.count):
+            if self.interval:
+                await asyncio.sleep(self.interval)
+            data = self.sweep
+            if self.noise:
+                data = tuple(s + self._noise(s.shape) for s in data)
+            yield RawSweep(index, time.perf_counter(), *data)
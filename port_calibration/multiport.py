@@ -0,0 +1,155 @@
+import numpy as np
+
+from .one_port import OnePortCalibration
+
+
+class MultiPortCalibration:
+    """P-port TOSL calibration with the error model stored as stacked (N, P, P) matrices.
+
+    The 12-term model of TwoPortCalibration is generalised per driven port j:
+        offset[i, j]   - directivity E_D (i == j) or isolation E_X (i != j)
+        tracking[i, j] - reflection tracking E_R (i == j) or transmission tracking E_T
+        match[i, j]    - source match E_S (i == j) or load match E_L of port i
+    With A = (Sm - offset) / tracking and B = I + match * A (elementwise),
+    the corrected S-matrix is S = A @ inv(B), solved for all points at once.
+    For P = 2 this reproduces TwoPortCalibration.
+    """
+
+    def __init__(
+        self,
+        open_sm,
+        short_sm,
+        load_sm,
+        thru_sm: dict,
+        s11_load=0,
+        s11_open=1,
+        s11_short=-1,
+    ):
+        """
+        :param open_sm, short_sm, load_sm - Reflection standards of every port, (N, P)
+        :param thru_sm - {(i, j): (N, 2, 2)} measured [[Sm_ii, Sm_ij], [Sm_ji, Sm_jj]]
+            of a thru between ports i < j, one for every port pair
+        :param s11_load, s11_open, s11_short - Ideal reflections, scalars or per-point arrays
+        """
+        self.open_sm = np.asarray(open_sm)
+        self.short_sm = np.asarray(short_sm)
+        self.load_sm = np.asarray(load_sm)
+        self.thru_sm = thru_sm
+        self.s11_load = s11_load
+        self.s11_open = s11_open
+        self.s11_short = s11_short
+
+        self.offset = None
+        self.tracking = None
+        self.match = None
+        self._inv_tracking = None
+
+    @property
+    def ports(self) -> int:
+        if self.offset is not None:
+            return self.offset.shape[-1]
+        return self.load_sm.shape[-1]
+
+    def _one_port_step(self):
+        """STEP 1: OSL for every port in one batched solve"""
+        s11 = [np.asarray(v) for v in (self.s11_load, self.s11_open, self.s11_short)]
+        # per-point ideal values broadcast along the port axis
+        s11 = [v[..., None] if v.ndim else v for v in s11]
+        cal = OnePortCalibration(
+            sm11_open=self.open_sm,
+            sm11_short=self.short_sm,
+            sm11_load=self.load_sm,
+            s11_load=s11[0],
+            s11_open=s11[1],
+            s11_short=s11[2],
+        )
+        cal.calculate_calibration()
+        return cal.cals["D"], cal.cals["S"], cal.cals["R"]
+
+    def calibrate(self):
+        P = self.ports
+        ED, ES, ER = self._one_port_step()
+        n = ED.shape[0]
+        shape = (n, P, P)
+        diag = np.arange(P)
+
+        # STEP 2: isolation is neglected, as in TwoPortCalibration
+        self.offset = np.zeros(shape, dtype=complex)
+        self.tracking = np.zeros(shape, dtype=complex)
+        self.match = np.zeros(shape, dtype=complex)
+        self.offset[:, diag, diag] = ED
+        self.tracking[:, diag, diag] = ER
+        self.match[:, diag, diag] = ES
+
+        # STEP 3: thru between every port pair, driven from both ends
+        for i in range(P):
+            for j in range(i + 1, P):
+                assert (i, j) in self.thru_sm, f"Missing thru between ports {i} and {j}"
+                sm = np.asarray(self.thru_sm[(i, j)])
+                for drive, receive, (r, t) in ((i, j, (0, 1)), (j, i, (1, 0))):
+                    sm_reflect = sm[:, r, r]
+                    sm_transmit = sm[:, t, r]
+                    delta_e = ED[:, drive] * ES[:, drive] - ER[:, drive]
+                    load_match = (sm_reflect - ED[:, drive]) / (
+                        sm_reflect * ES[:, drive] - delta_e
+                    )
+                    self.match[:, receive, drive] = load_match
+                    self.tracking[:, receive, drive] = (
+                        sm_transmit - self.offset[:, receive, drive]
+                    ) * (1 - ES[:, drive] * load_match)
+        self._inv_tracking = 1 / self.tracking
+
+    def correct(self, sm):
+        """Corrected S-matrices of measured (..., P, P) S-matrices"""
+        assert self._inv_tracking is not None, "Call calibrate() before correct()!"
+        A = (np.asarray(sm) - self.offset) * self._inv_tracking
+        B = self.match * A
+        B += np.eye(self.ports)
+        # S @ B = A  <=>  B^T @ S^T = A^T
+        return np.swapaxes(
+            np.linalg.solve(np.swapaxes(B, -1, -2), np.swapaxes(A, -1, -2)), -1, -2
+        )
+
+    def predict(self, s):
+        """Raw S-matrices the VNA would measure for true (..., P, P) S-matrices ``s``"""
+        assert self._inv_tracking is not None, "Call calibrate() before predict()!"
+        s = np.asarray(s, dtype=complex)
+        shape = np.broadcast_shapes(s.shape, self.match.shape)
+        s = np.broadcast_to(s, shape)
+        eye = np.eye(self.ports)
+        A = np.empty(shape, dtype=complex)
+        # column j of A solves (I - S diag(match[:, j])) a = S e_j
+        for j in range(self.ports):
+            m = np.broadcast_to(self.match[..., :, j], shape[:-1])
+            A[..., :, j] = np.linalg.solve(eye - s * m[..., None, :], s[..., :, j, None])[..., 0]
+        return self.offset + self.tracking * A
+
+    @classmethod
+    def from_error_terms(cls, offset, tracking, match) -> "MultiPortCalibration":
+        """Calibration ready for correction from stacked (N, P, P) error matrices"""
+        cal = cls(None, None, None, {})
+        cal.offset = np.asarray(offset)
+        cal.tracking = np.asarray(tracking)
+        cal.match = np.asarray(match)
+        cal._inv_tracking = 1 / cal.tracking
+        return cal
+
+    @classmethod
+    def from_two_port(cls, cal) -> "MultiPortCalibration":
+        """Stacked error model of a solved TwoPortCalibration"""
+        terms = cal.cals()
+        return cls.from_error_terms(
+            offset=_stack_2x2(terms["E00"], terms["E03'"], terms["E30"], terms["E33'"]),
+            tracking=_stack_2x2(
+                terms["E10E01"], terms["E23'E01'"], terms["E10E32"], terms["E23'E32'"]
+            ),
+            match=_stack_2x2(terms["E11"], terms["E11'"], terms["E22"], terms["E22'"]),
+        )
+
+
+def _stack_2x2(s00, s01, s10, s11):
+    """(N, 2, 2) matrices [[s00, s01], [s10, s11]] from (N,) arrays"""
+    values = np.broadcast_arrays(
+        *(np.asarray(v, dtype=complex) for v in (s00, s01, s10, s11))
+    )
+    return np.stack(values, axis=-1).reshape(values[0].shape + (2, 2))
@@ -1,9 +1,15 @@
 import numpy as np
 
+from .instrumentation import span
+
 
 class OnePortCalibration:
     """One port S11 calibration based on OSL (Open, Short, Load/Match) calibration"""
 
+    # Points whose 3x3 system has a larger condition number are solved with
+    # least squares instead of the batched direct solve
+    cond_threshold = 1e12
+
     def __init__(
         self,
         sm11_open,
@@ -12,6 +18,7 @@ class OnePortCalibration:
         s11_open: float = 1,
         s11_short: float = -1,
         s11_load: float = 0,
+        dtype=complex,
     ):
         """
         :param sm11_open - Calibration data for Open
@@ -20,6 +27,8 @@ class OnePortCalibration:
         :param s11_open - Ideal open reflection coeff
         :param s11_short - Ideal short reflection coeff
         :param s11_load - Ideal load reflection coeff
+        :param dtype - dtype of the error terms and corrections, e.g. np.complex64;
+            the solve always runs in complex128
         """
         self.sm11_open = sm11_open
         self.sm11_short = sm11_short
@@ -29,6 +38,8 @@ class OnePortCalibration:
         self.s11_load = s11_load
         self.calibrated_measure = []
         self.cals = {"D": [], "S": [], "R": []}
+        self.cond = None
+        self.dtype = np.dtype(dtype)
 
     @staticmethod
     def calculate_error_matrix(C, V):
@@ -47,24 +58,91 @@ class OnePortCalibration:
 
     def calibrate_measure(self, sm11):
         assert sm11 is not None, "Measure data should not be None!"
-        gamma = (sm11 - self.cals["D"]) / (
-            self.cals["R"] + self.cals["S"] * (sm11 - self.cals["D"])
-        )
+        with span("one_port.correct", np.size(sm11)):
+            gamma = (sm11 - self.cals["D"]) / (
+                self.cals["R"] + self.cals["S"] * (sm11 - self.cals["D"])
+            )
         self.calibrated_measure = gamma
         return gamma
 
+    def predict(self, s11):
+        """Raw reading of a standard with actual reflection ``s11``, inverse of calibrate_measure"""
+        s11 = np.asarray(s11)
+        D, S, R = (np.asarray(self.cals[key]) for key in ("D", "S", "R"))
+        return D + R * s11 / (1 - S * s11)
+
+    def build_system(self):
+        """Stacked OSL systems C @ x = V for every point, C: (N, 3, 3), V: (N, 3)"""
+        sm = np.stack(
+            np.broadcast_arrays(
+                np.asarray(self.sm11_load, dtype=complex),
+                np.asarray(self.sm11_open, dtype=complex),
+                np.asarray(self.sm11_short, dtype=complex),
+            ),
+            axis=-1,
+        )
+        shape = sm.shape[:-1]
+        sm = sm.reshape(-1, 3)
+        s = np.stack(
+            [
+                np.broadcast_to(np.asarray(v, dtype=complex), shape).reshape(-1)
+                for v in (self.s11_load, self.s11_open, self.s11_short)
+            ],
+            axis=-1,
+        )
+        C = np.empty((sm.shape[0], 3, 3), dtype=complex)
+        C[:, :, 0] = s
+        C[:, :, 1] = 1
+        C[:, :, 2] = s * sm
+        return C, sm, shape
+
     def calculate_calibration(self):
-        self.cals = {"D": [], "S": [], "R": []}
-        for i in range(len(self.sm11_load)):
-            C = np.array(
-                [
-                    [self.s11_load, 1, self.s11_load * self.sm11_load[i]],
-                    [self.s11_open, 1, self.s11_open * self.sm11_open[i]],
-                    [self.s11_short, 1, self.s11_short * self.sm11_short[i]],
-                ]
-            )
-            V = np.array([self.sm11_load[i], self.sm11_open[i], self.sm11_short[i]])
-            self.append_error_coeffs(self.calculate_error_matrix(C, V))
+        """Solve OSL error terms for all points at once.
+
+        Well conditioned points are solved in closed form through the 3x3 inverse,
+        the rest fall back to ``np.linalg.lstsq`` point by point.
+        Per-point 1-norm condition numbers are stored in ``self.cond``.
+        """
+        with span("one_port.solve") as timing:
+            C, V, shape = self.build_system()
+            C_inv, cond = _inverse_3x3(C)
+            good = np.isfinite(cond) & (cond < self.cond_threshold)
+
+            x = np.einsum("nij,nj->ni", C_inv, V)
+            for i in np.flatnonzero(~good):
+                x[i] = self.calculate_error_matrix(C[i], V[i])
+
+            D = x[:, 1]
+            S = x[:, 2]
+            self.cals = {
+                "D": D.reshape(shape).astype(self.dtype, copy=False),
+                "S": S.reshape(shape).astype(self.dtype, copy=False),
+                "R": (x[:, 0] + D * S).reshape(shape).astype(self.dtype, copy=False),
+            }
+            self.cond = cond.reshape(shape)
+            timing.points = V.shape[0]
+
+
+def _inverse_3x3(C):
+    """Batched inverse of (N, 3, 3) matrices by cofactors and their 1-norm condition numbers"""
+    a, b, c = C[:, 0, 0], C[:, 0, 1], C[:, 0, 2]
+    d, e, f = C[:, 1, 0], C[:, 1, 1], C[:, 1, 2]
+    g, h, k = C[:, 2, 0], C[:, 2, 1], C[:, 2, 2]
+
+    adj = np.empty_like(C)
+    adj[:, 0, 0] = e * k - f * h
+    adj[:, 0, 1] = c * h - b * k
+    adj[:, 0, 2] = b * f - c * e
+    adj[:, 1, 0] = f * g - d * k
+    adj[:, 1, 1] = a * k - c * g
+    adj[:, 1, 2] = c * d - a * f
+    adj[:, 2, 0] = d * h - e * g
+    adj[:, 2, 1] = b * g - a * h
+    adj[:, 2, 2] = a * e - b * d
+    det = a * adj[:, 0, 0] + b * adj[:, 1, 0] + c * adj[:, 2, 0]
 
-        for k in self.cals.keys():
-            self.cals[k] = np.array(self.cals[k])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        C_inv = adj / det[:, None, None]
+        cond = np.abs(C).sum(axis=1).max(axis=1) * np.abs(C_inv).sum(axis=1).max(axis=1)
+    cond[~np.isfinite(cond)] = np.inf
+    return C_inv, cond
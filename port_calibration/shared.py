@@ -0,0 +1,162 @@
+"""Serving one solved calibration to many worker processes without copies.
+
+The publisher writes the error terms and the derived correction coefficients
+of a TwoPortCalibration once, as a versioned ``.npy`` file in a shared memory
+backed directory (``/dev/shm`` where available). Workers memory map it
+read-only, so every process corrects from the same physical pages::
+
+    store = SharedCalibrationStore("lab-vna")       # publisher
+    store.publish(cal)
+
+    shared = SharedCalibration("lab-vna")           # in every worker
+    s11, s22, s12, s21 = shared.correct(sm11, sm22, sm12, sm21)
+    shared.refresh()                                # pick up a newer version
+
+A new version is written under a new file name and becomes current through an
+atomic rename of the ``VERSION`` file. Workers keep using the mapping they hold
+until they refresh, superseded files are unlinked but stay valid while mapped.
+"""
+import os
+import tempfile
+import time
+import uuid
+
+from .storage import CALS_KEYS, _load_rows, _save_rows
+from .two_port import DERIVED_COEFFS, TwoPortCalibration
+
+SHARED_KEYS = CALS_KEYS + DERIVED_COEFFS
+# Attempts of SharedCalibration to open the current version, the sleep between
+# attempts starts at ATTACH_BACKOFF seconds and doubles
+ATTACH_RETRIES = 10
+ATTACH_BACKOFF = 0.005
+
+
+def _default_directory() -> str:
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def _replace_atomic(path: str, write):
+    tmp = f"{path}.tmp-{uuid.uuid4().hex}"
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class SharedCalibrationStore:
+    """Versioned calibrations of one name, ``<directory>/port-cal-<name>/v<version>.npy``"""
+
+    def __init__(self, name: str, directory: str = None, keep: int = 2):
+        """
+        :param name - Name workers attach to
+        :param directory - Base directory, /dev/shm or the temporary directory by default
+        :param keep - Number of latest versions kept on publish
+        """
+        assert keep >= 1, "At least the current version must be kept"
+        self.name = name
+        self.directory = os.path.join(directory or _default_directory(), f"port-cal-{name}")
+        self.keep = keep
+
+    def _path(self, version: int) -> str:
+        return os.path.join(self.directory, f"v{version}.npy")
+
+    def version(self) -> int:
+        """Current version, 0 before the first publish"""
+        try:
+            with open(os.path.join(self.directory, "VERSION")) as f:
+                return int(f.read())
+        except FileNotFoundError:
+            return 0
+
+    def versions(self):
+        if not os.path.isdir(self.directory):
+            return []
+        names = os.listdir(self.directory)
+        return sorted(int(f[1:-4]) for f in names if f.startswith("v") and f.endswith(".npy"))
+
+    def publish(self, cal) -> int:
+        """Publish a solved TwoPortCalibration as the next version, returns the version"""
+        assert cal._coeffs is not None, "Call calibrate() before publish()!"
+        os.makedirs(self.directory, exist_ok=True)
+        version = max([self.version()] + self.versions()) + 1
+        cals = cal.cals()
+        rows = {**cals, **{key: cal._coeffs[key] for key in DERIVED_COEFFS}}
+        _replace_atomic(
+            self._path(version), lambda tmp: _save_rows(tmp, SHARED_KEYS, rows, dtype=cal.dtype)
+        )
+
+        def write_version(tmp):
+            with open(tmp, "w") as f:
+                f.write(str(version))
+
+        _replace_atomic(os.path.join(self.directory, "VERSION"), write_version)
+        for old in self.versions()[: -self.keep]:
+            try:
+                os.remove(self._path(old))
+            except OSError:
+                # still mapped on platforms that do not allow unlinking open files
+                pass
+        return version
+
+    def attach(self, version: int = None) -> TwoPortCalibration:
+        """Read-only TwoPortCalibration memory mapped from ``version``, the current by default"""
+        if version is None:
+            version = self.version()
+            assert version, f"Nothing published under {self.name}"
+        rows = _load_rows(self._path(version), SHARED_KEYS, mmap_mode="r")
+        cal = TwoPortCalibration.from_cals({key: rows[key] for key in CALS_KEYS}, derived=rows)
+        cal.version = version
+        return cal
+
+    def close(self):
+        """Remove every published version"""
+        if not os.path.isdir(self.directory):
+            return
+        # workers stop finding a current version before its file disappears
+        try:
+            os.remove(os.path.join(self.directory, "VERSION"))
+        except FileNotFoundError:
+            pass
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+        os.rmdir(self.directory)
+
+
+class SharedCalibration:
+    """Worker side handle: the current shared calibration, swapped on refresh()"""
+
+    def __init__(self, name: str, directory: str = None):
+        self.store = SharedCalibrationStore(name, directory)
+        self.calibration = self._attach()
+
+    def _attach(self) -> TwoPortCalibration:
+        delay = ATTACH_BACKOFF
+        for attempt in range(ATTACH_RETRIES):
+            try:
+                return self.store.attach()
+            except FileNotFoundError:
+                # superseded between reading VERSION and opening the file
+                if attempt == ATTACH_RETRIES - 1:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+
+    @property
+    def version(self) -> int:
+        return self.calibration.version
+
+    def refresh(self) -> bool:
+        """Switch to the latest published version, True if it changed"""
+        if self.store.version() == self.calibration.version:
+            return False
+        self.calibration = self._attach()
+        return True
+
+    def correct(self, sm11, sm22, sm12, sm21, out=None):
+        """TwoPortCalibration.correct with the calibration current at call time"""
+        return self.calibration.correct(sm11, sm22, sm12, sm21, out=out)
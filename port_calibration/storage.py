@@ -0,0 +1,123 @@
+"""Binary storage of calibration standards and solved error terms.
+
+Both kinds are stored as a single ``.npy`` file holding one contiguous
+``(12, N)`` complex128 array, one row per key in ``STANDARD_KEYS`` or
+``CALS_KEYS`` order. The ``.npy`` header carries dtype and shape, so files
+can be opened with ``mmap_mode`` and rows are returned as views into the map.
+"""
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from .two_port import TwoPortCalibration
+from .utils import STANDARD_KEYS, load_json_sparam, standard_paths
+
+
+CALS_KEYS = (
+    "E00",
+    "E11",
+    "E10E01",
+    "E30",
+    "E22",
+    "E10E32",
+    "E33'",
+    "E22'",
+    "E23'E32'",
+    "E03'",
+    "E11'",
+    "E23'E01'",
+)
+
+
+def _save_rows(path: str, keys, rows: dict, dtype=complex):
+    n = np.broadcast_shapes(*(np.shape(rows[key]) for key in keys))
+    data = open_memmap(path, mode="w+", dtype=dtype, shape=(len(keys),) + n)
+    for i, key in enumerate(keys):
+        data[i] = rows[key]
+    data.flush()
+    del data
+
+
+def _load_rows(path: str, keys, mmap_mode) -> dict:
+    data = np.load(path, mmap_mode=mmap_mode)
+    assert data.shape[0] == len(keys), f"{path}: expected {len(keys)} rows, got {data.shape[0]}"
+    return {key: data[i] for i, key in enumerate(keys)}
+
+
+def save_standards(path: str, standards: dict):
+    """Save the 12 raw standard measurements (keys as in ``load_two_port_cals``)"""
+    _save_rows(path, STANDARD_KEYS, standards)
+
+
+def load_standards(path: str, mmap_mode="r") -> dict:
+    """Load raw standard measurements, memory mapped unless ``mmap_mode`` is None"""
+    return _load_rows(path, STANDARD_KEYS, mmap_mode)
+
+
+def save_cals(path: str, cals, dtype=None):
+    """Save solved error terms, ``cals`` is a TwoPortCalibration or its cals() dict
+
+    :param dtype - Stored dtype, by default the calibration's dtype or that of the terms
+    """
+    if isinstance(cals, TwoPortCalibration):
+        dtype = cals.dtype if dtype is None else dtype
+        cals = cals.cals()
+    if dtype is None:
+        dtype = np.result_type(*(cals[key] for key in CALS_KEYS), 1j)
+    _save_rows(path, CALS_KEYS, cals, dtype=dtype)
+
+
+def load_cals(path: str, mmap_mode="r") -> dict:
+    """Load solved error terms as a cals() dict"""
+    return _load_rows(path, CALS_KEYS, mmap_mode)
+
+
+def load_two_port_cals_npy(
+    standards_path: str,
+    cals_path: str = None,
+    s11_load=0.01,
+    s11_open=0.99,
+    s11_short=-0.99,
+    mmap_mode="r",
+    dtype=complex,
+):
+    """Binary counterpart of ``load_two_port_cals``.
+
+    When ``cals_path`` is given the stored error terms are used and the solve is skipped.
+    """
+    standards = load_standards(standards_path, mmap_mode=mmap_mode)
+    two_cal = TwoPortCalibration(
+        **standards,
+        s11_load=s11_load,
+        s11_open=s11_open,
+        s11_short=s11_short,
+        dtype=dtype,
+    )
+    if cals_path is None:
+        two_cal.calibrate()
+    else:
+        two_cal.set_cals(load_cals(cals_path, mmap_mode=mmap_mode))
+    return two_cal, standards
+
+
+def convert_json_dirs(
+    open_dir: str,
+    short_dir: str,
+    load_dir: str,
+    through_dir: str,
+    path: str,
+):
+    """Convert the JSON open/short/load/through directory layout into a standards file.
+
+    Files are converted one at a time, so only one JSON file is held in memory.
+    """
+    paths = standard_paths(open_dir, short_dir, load_dir, through_dir)
+    data = None
+    for i, key in enumerate(STANDARD_KEYS):
+        row = load_json_sparam(paths[key])
+        if data is None:
+            data = open_memmap(
+                path, mode="w+", dtype=complex, shape=(len(STANDARD_KEYS), len(row))
+            )
+        data[i] = row
+    data.flush()
+    del data
@@ -0,0 +1,86 @@
+"""Chunked correction of sweeps that do not fit in memory.
+
+A chunk stream yields ``(index, arrays)`` pairs. ``index`` is a tuple whose
+last element is the frequency slice of the chunk (leading elements select
+e.g. a sweep of a multi-sweep recording), ``arrays`` are the raw measurements
+of that chunk. Error terms are sliced to the same frequency range, corrected
+results are handed to ``sink(index, results)`` chunk by chunk. Result buffers
+are reused between chunks, so the sink must copy or write them out.
+"""
+import numpy as np
+
+from .one_port import OnePortCalibration
+from .two_port import TwoPortCalibration, _correct
+
+
+def iter_chunks(arrays, chunk_size: int):
+    """Chunk stream over equally shaped (possibly memory mapped) arrays.
+
+    The last axis is the frequency axis and is split into ``chunk_size`` slices,
+    leading axes (sweeps) are walked one row at a time.
+    """
+    shape = np.shape(arrays[0])
+    n = shape[-1]
+    for row in np.ndindex(*shape[:-1]):
+        for start in range(0, n, chunk_size):
+            index = row + (slice(start, min(start + chunk_size, n)),)
+            yield index, tuple(a[index] for a in arrays)
+
+
+def array_sink(*outputs):
+    """Sink writing each result into the matching preallocated array (e.g. np.memmap)"""
+
+    def sink(index, results):
+        for out, result in zip(outputs, results):
+            out[index] = result
+
+    return sink
+
+
+def _slice_terms(terms: dict, sl: slice) -> dict:
+    return {k: v[..., sl] if np.ndim(v) else v for k, v in terms.items()}
+
+
+class _Buffers:
+    """Output and workspace buffers reused while the chunk shape stays the same"""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.buffers = None
+
+    def __call__(self, shape, dtype):
+        b = self.buffers
+        if b is None or b[0].shape != shape or b[0].dtype != dtype:
+            b = [np.empty(shape, dtype=dtype) for _ in range(self.count)]
+            self.buffers = b
+        return b
+
+
+def correct_two_port_stream(cal: TwoPortCalibration, chunks, sink):
+    """Correct a stream of (sm11, sm22, sm12, sm21) chunks with ``cal``.
+
+    Results are (S11, S22, S12, S21) as returned by TwoPortCalibration.correct().
+    Peak memory is a few chunk-sized buffers regardless of the sweep length.
+    """
+    assert cal._coeffs is not None, "Call calibrate() before correcting!"
+    workspace = _Buffers(6)
+    outputs = _Buffers(4)
+    for index, (sm11, sm22, sm12, sm21) in chunks:
+        coeffs = _slice_terms(cal._coeffs, index[-1])
+        shape = np.broadcast_shapes(np.shape(sm11), coeffs["e00"].shape)
+        dtype = np.result_type(sm11, sm22, sm12, sm21, coeffs["e00"], 1j)
+        out = outputs(shape, dtype)
+        sink(index, _correct(coeffs, sm11, sm22, sm12, sm21, out, workspace(shape, dtype)))
+
+
+def correct_one_port_stream(cal: OnePortCalibration, chunks, sink):
+    """Correct a stream of (sm11,) chunks with ``cal``, results are (S11,)"""
+    outputs = _Buffers(1)
+    for index, (sm11,) in chunks:
+        terms = _slice_terms(cal.cals, index[-1])
+        shape = np.broadcast_shapes(np.shape(sm11), np.shape(terms["D"]))
+        (gamma,) = outputs(shape, np.result_type(sm11, terms["D"], 1j))
+        np.subtract(sm11, terms["D"], out=gamma)
+        denominator = terms["R"] + terms["S"] * gamma
+        np.divide(gamma, denominator, out=gamma)
+        sink(index, (gamma,))
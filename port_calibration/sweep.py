@@ -0,0 +1,89 @@
+"""Two port sweep stored as one contiguous (N, 2, 2) complex array.
+
+``Sweep.s11`` / ``s22`` / ``s12`` / ``s21`` (and the ``sm*`` aliases used for
+raw readings) are strided views into that array, so a sweep is allocated once
+by its loader and passed through calibration and correction without copies::
+
+    sweeps = load_two_port_sweeps("open/", "short/", "load/", "through/")
+    cal = TwoPortCalibration.from_sweeps(**sweeps)
+    cal.calibrate()
+    corrected = cal.correct_sweep(read_sweep("dut.s2p"))
+"""
+import numpy as np
+
+
+class Sweep:
+    """S-matrices ``data`` of shape (..., N, 2, 2) on an optional ``frequency`` axis.
+
+    Every S-matrix is one packed 2x2 block, data with any other layout is copied
+    into C order on construction.
+    """
+
+    __slots__ = ("data", "frequency")
+
+    def __init__(self, data, frequency=None):
+        data = np.asarray(data)
+        assert data.shape[-2:] == (2, 2), f"Expected (..., N, 2, 2) data, got {data.shape}"
+        assert np.iscomplexobj(data), "Sweep data must be complex"
+        if data.strides[-2:] != (2 * data.itemsize, data.itemsize):
+            # e.g. a transposed view; the correction reads packed 2x2 blocks
+            data = np.ascontiguousarray(data)
+        self.data = data
+        self.frequency = None if frequency is None else np.asarray(frequency)
+        if self.frequency is not None:
+            assert self.frequency.shape == data.shape[-3:-2], "Frequency axis does not match data"
+
+    @classmethod
+    def empty(cls, points: int, frequency=None, dtype=complex) -> "Sweep":
+        return cls(np.zeros((points, 2, 2), dtype=dtype), frequency)
+
+    @classmethod
+    def empty_like(cls, sweep: "Sweep") -> "Sweep":
+        return cls(np.zeros(sweep.data.shape, dtype=sweep.data.dtype), sweep.frequency)
+
+    @classmethod
+    def from_params(cls, s11, s22, s12, s21, frequency=None) -> "Sweep":
+        """Sweep filled from separate parameter arrays, the only copy made"""
+        shape = np.broadcast_shapes(*(np.shape(s) for s in (s11, s22, s12, s21)))
+        dtype = np.result_type(s11, s22, s12, s21, 1j)
+        sweep = cls(np.empty(shape + (2, 2), dtype=dtype), frequency)
+        sweep.s11[...] = s11
+        sweep.s22[...] = s22
+        sweep.s12[...] = s12
+        sweep.s21[...] = s21
+        return sweep
+
+    @property
+    def s11(self) -> np.ndarray:
+        return self.data[..., 0, 0]
+
+    @property
+    def s12(self) -> np.ndarray:
+        return self.data[..., 0, 1]
+
+    @property
+    def s21(self) -> np.ndarray:
+        return self.data[..., 1, 0]
+
+    @property
+    def s22(self) -> np.ndarray:
+        return self.data[..., 1, 1]
+
+    # raw (uncorrected) readings
+    sm11, sm12, sm21, sm22 = s11, s12, s21, s22
+
+    def params(self):
+        """(S11, S22, S12, S21) views, the argument order of correct()"""
+        return self.s11, self.s22, self.s12, self.s21
+
+    def __len__(self) -> int:
+        return self.data.shape[-3]
+
+    def __getitem__(self, index) -> "Sweep":
+        """Sweep view of a frequency slice, e.g. ``sweep[100:200]``"""
+        assert isinstance(index, slice), "Sweeps are sliced along frequency only"
+        frequency = None if self.frequency is None else self.frequency[index]
+        return Sweep(self.data[..., index, :, :], frequency)
+
+    def __repr__(self) -> str:
+        return f"Sweep(points={len(self)}, shape={self.data.shape}, dtype={self.data.dtype})"
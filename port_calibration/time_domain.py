@@ -0,0 +1,184 @@
+"""Time domain transform and gating of corrected S-parameters.
+
+Sweeps are stacked along leading axes with frequency on the last axis, so
+thousands of sweeps go through one FFT call. Window, padded FFT size and bin
+mapping depend only on the frequency grid and are cached per grid::
+
+    time, h = impulse_response(frequency, s11)  # s11 of shape (sweeps, N)
+    s11_gated = time_gate(frequency, s11, start=0.5e-9, stop=1.5e-9)
+
+Low pass mode needs a harmonic grid (every point a multiple of the step) and
+extrapolates DC, it gives real responses with a step response. Band pass mode
+works on any uniform grid and gives complex responses.
+"""
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+from .instrumentation import span
+
+MODES = ("lowpass", "bandpass")
+
+_CACHE = OrderedDict()
+_CACHE_SIZE = 16
+
+
+class TimeDomain:
+    """Window, FFT size and time axis of one frequency grid"""
+
+    def __init__(self, frequency, mode: str = "lowpass", beta: float = 6.0, n_fft=None):
+        """
+        :param frequency - Uniform frequency grid [Hz], harmonic for "lowpass"
+        :param mode - "lowpass" or "bandpass"
+        :param beta - Kaiser window parameter, 0 is rectangular
+        :param n_fft - FFT size, by default twice the next power of two that fits the grid
+        """
+        assert mode in MODES, f"Unknown mode {mode}, expected one of {MODES}"
+        f = np.asarray(frequency, dtype=float)
+        assert f.ndim == 1 and len(f) >= 2, "At least two frequency points are needed"
+        df = (f[-1] - f[0]) / (len(f) - 1)
+        uniform = df > 0 and np.allclose(np.diff(f), df, rtol=1e-6)
+        assert uniform, "Frequency grid must be uniform and increasing"
+        self.frequency = f
+        self.mode = mode
+        self.beta = beta
+        self.df = df
+
+        n = len(f)
+        if mode == "lowpass":
+            first = f[0] / df
+            self.first = int(round(first))
+            assert abs(first - self.first) < 1e-6, "Low pass mode needs a harmonic grid"
+            bins = self.first + n  # DC up to the last point
+            window = np.kaiser(2 * bins - 1, beta)[bins - 1 :]
+            needed = 2 * (bins - 1)
+            # a constant spectrum gives a unit impulse
+            gain = 2 * window.sum() - window[0]
+        else:
+            self.first = 0
+            window = np.kaiser(n, beta)
+            needed = n
+            gain = window.sum()
+        if n_fft is None:
+            n_fft = 2 ** int(np.ceil(np.log2(needed))) * 2
+        assert n_fft >= needed, f"n_fft must be at least {needed}"
+        self.n_fft = n_fft
+        self.window = window
+        self.scale = n_fft / gain
+        # window on the measured points only, divided out after gating
+        self._measured_window = window[self.first :]
+
+        dt = 1 / (n_fft * df)
+        self.time = (np.arange(n_fft) - n_fft // 2) * dt
+
+    def _spectrum(self, s):
+        """Windowed spectrum on the FFT bins, DC extrapolated in low pass mode"""
+        s = np.asarray(s, dtype=complex)
+        assert s.shape[-1] == len(self.frequency), "Last axis must match the frequency grid"
+        if self.mode == "bandpass":
+            return s * self.window
+        spectrum = np.empty(s.shape[:-1] + (len(self.window),), dtype=complex)
+        spectrum[..., self.first :] = s
+        if self.first:
+            # linear extrapolation to DC, where a physical response is real
+            dc = (s[..., 0] - self.first * (s[..., 1] - s[..., 0])).real
+            ratio = np.arange(self.first) / self.first
+            spectrum[..., : self.first] = dc[..., None] + ratio * (s[..., :1] - dc[..., None])
+        spectrum *= self.window
+        return spectrum
+
+    def _to_time(self, spectrum):
+        if self.mode == "lowpass":
+            return np.fft.irfft(spectrum, self.n_fft, axis=-1)
+        return np.fft.ifft(spectrum, self.n_fft, axis=-1)
+
+    def _to_frequency(self, response):
+        if self.mode == "lowpass":
+            spectrum = np.fft.rfft(response, axis=-1)
+        else:
+            spectrum = np.fft.fft(response, axis=-1)
+        return spectrum[..., self.first : self.first + len(self.frequency)]
+
+    def impulse(self, s):
+        """Impulse response of (..., N) spectra on ``time``, real in low pass mode"""
+        with span("time_domain.impulse", s.shape[-1]):
+            response = self._to_time(self._spectrum(s))
+            response *= self.scale
+            return np.fft.fftshift(response, axes=-1)
+
+    def step(self, s):
+        """Step response of (..., N) spectra on ``time``, low pass mode only"""
+        assert self.mode == "lowpass", "Step response needs low pass mode"
+        with span("time_domain.step", s.shape[-1]):
+            # unscaled, so the final value is the DC response
+            response = np.fft.fftshift(self._to_time(self._spectrum(s)), axes=-1)
+            return np.cumsum(response, axis=-1, out=response)
+
+    def gate_window(self, start: float, stop: float, beta: float = 0.0):
+        """Gate on ``time``: Kaiser window between start and stop [s], zero outside"""
+        assert stop > start, "Gate stop must be after start"
+        gate = np.zeros(self.n_fft)
+        inside = np.flatnonzero((self.time >= start) & (self.time <= stop))
+        assert inside.size, "Gate is narrower than the time resolution"
+        gate[inside] = np.kaiser(inside.size, beta)
+        return gate
+
+    def gate(self, s, start: float, stop: float, beta: float = 0.0):
+        """Spectra of (..., N) ``s`` keeping only responses between start and stop [s]"""
+        with span("time_domain.gate", s.shape[-1]):
+            gate = np.fft.ifftshift(self.gate_window(start, stop, beta))
+            response = self._to_time(self._spectrum(s))
+            response *= gate
+            gated = self._to_frequency(response)
+            gated /= self._measured_window
+            return gated
+
+
+def cached_time_domain(
+    frequency, mode: str = "lowpass", beta: float = 6.0, n_fft=None
+) -> TimeDomain:
+    """TimeDomain of ``frequency``, cached per (grid, mode, beta, n_fft)"""
+    f = np.ascontiguousarray(frequency, dtype=float)
+    key = (hashlib.sha1(f.tobytes()).hexdigest(), f.shape, mode, beta, n_fft)
+    cached = _CACHE.get(key)
+    if cached is not None:
+        _CACHE.move_to_end(key)
+        return cached
+
+    result = TimeDomain(f, mode=mode, beta=beta, n_fft=n_fft)
+    _CACHE[key] = result
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return result
+
+
+def impulse_response(frequency, s, mode: str = "lowpass", beta: float = 6.0, n_fft=None):
+    """(time, impulse response) of (..., N) spectra ``s``"""
+    td = cached_time_domain(frequency, mode, beta, n_fft)
+    return td.time, td.impulse(np.asarray(s))
+
+
+def step_response(frequency, s, beta: float = 6.0, n_fft=None):
+    """(time, low pass step response) of (..., N) spectra ``s``"""
+    td = cached_time_domain(frequency, "lowpass", beta, n_fft)
+    return td.time, td.step(np.asarray(s))
+
+
+def time_gate(
+    frequency,
+    s,
+    start: float,
+    stop: float,
+    mode: str = "bandpass",
+    beta: float = 6.0,
+    gate_beta: float = 0.0,
+    n_fft=None,
+):
+    """Spectra of (..., N) ``s`` gated to responses between start and stop [s].
+
+    :param beta - Kaiser parameter of the frequency window, divided out again after gating
+    :param gate_beta - Kaiser parameter of the gate itself, 0 is a rectangular gate
+    """
+    td = cached_time_domain(frequency, mode, beta, n_fft)
+    return td.gate(np.asarray(s), start, stop, gate_beta)
@@ -0,0 +1,240 @@
+"""Touchstone (v1 ``.sNp``) reader and writer.
+
+Comments and the option line are removed with regular expressions and all
+numbers are parsed in one ``np.fromstring`` call, so large files are read
+without a Python loop over lines.
+"""
+import re
+import warnings
+from typing import Tuple
+
+import numpy as np
+
+from .sweep import Sweep
+from .two_port import TwoPortCalibration
+
+
+FREQUENCY_UNITS = {"HZ": 1.0, "KHZ": 1e3, "MHZ": 1e6, "GHZ": 1e9}
+FORMATS = ("RI", "MA", "DB")
+
+_COMMENT = re.compile(r"!.*")
+_OPTION = re.compile(r"^[ \t]*#(.*)$", re.M)
+_PORTS = re.compile(r"\.s(\d+)p$", re.I)
+
+
+def ports_from_path(path: str) -> int:
+    match = _PORTS.search(path)
+    assert match, f"{path}: cannot tell the number of ports, expected a .sNp extension"
+    return int(match.group(1))
+
+
+def _parse_options(line: str):
+    unit, fmt, z0 = "GHZ", "MA", 50.0
+    tokens = line.upper().split()
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in FREQUENCY_UNITS:
+            unit = token
+        elif token in FORMATS:
+            fmt = token
+        elif token == "R":
+            i += 1
+            z0 = float(tokens[i])
+        elif token != "S":
+            raise ValueError(
+                f"Unsupported Touchstone option {token!r}, only S parameters are supported"
+            )
+        i += 1
+    return unit, fmt, z0
+
+
+def _to_complex(a, b, fmt: str) -> np.ndarray:
+    if fmt == "RI":
+        return a + 1j * b
+    magnitude = a if fmt == "MA" else 10 ** (a / 20)
+    return magnitude * np.exp(1j * np.deg2rad(b))
+
+
+def _from_complex(s: np.ndarray, fmt: str):
+    if fmt == "RI":
+        return s.real, s.imag
+    magnitude = np.abs(s)
+    if fmt == "DB":
+        with np.errstate(divide="ignore"):
+            magnitude = 20 * np.log10(magnitude)
+    return magnitude, np.rad2deg(np.angle(s))
+
+
+def read_touchstone(path: str, ports: int = None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """
+    :param path - Touchstone file
+    :param ports - Number of ports, taken from the ``.sNp`` extension by default
+    :return frequency in Hz (N,), S-matrix (N, P, P), reference impedance
+    """
+    ports = ports or ports_from_path(path)
+    with open(path, "r") as f:
+        text = f.read()
+    if "!" in text:
+        text = _COMMENT.sub("", text)
+    # only the first option line counts, later ones are ignored
+    start = text.find("#")
+    if start >= 0:
+        end = text.find("\n", start)
+        end = len(text) if end < 0 else end
+        unit, fmt, z0 = _parse_options(text[start + 1:end])
+        text = text[:start] + text[end:]
+        if "#" in text:
+            text = _OPTION.sub("", text)
+    else:
+        unit, fmt, z0 = _parse_options("")
+    if "[" in text:
+        raise ValueError(f"{path}: Touchstone 2.0 keywords are not supported")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(text, dtype=float, sep=" ")
+        except DeprecationWarning:
+            raise ValueError(f"{path}: invalid number in Touchstone data") from None
+    columns = 1 + 2 * ports * ports
+    if values.size % columns:
+        raise ValueError(f"{path}: {values.size} values do not form rows of {columns}")
+    values = values.reshape(-1, columns)
+
+    frequency = values[:, 0] * FREQUENCY_UNITS[unit]
+    order = np.arange(ports * ports)
+    if ports == 2:
+        # 2-port data is ordered S11 S21 S12 S22
+        order = order.reshape(ports, ports).T.ravel()
+    # real parts at 1 + 2 * k; gathering in row-major order gives a C-ordered S-matrix
+    real = 1 + 2 * order
+    s = _to_complex(values[:, real], values[:, real + 1], fmt).reshape(-1, ports, ports)
+    return frequency, s, z0
+
+
+def write_touchstone(
+    path: str,
+    frequency,
+    s,
+    fmt: str = "RI",
+    unit: str = "GHZ",
+    z0: float = 50,
+    comment: str = None,
+):
+    """
+    :param frequency - Frequency in Hz (N,)
+    :param s - S-matrix (N, P, P), or (N,) for a one port
+    """
+    fmt, unit = fmt.upper(), unit.upper()
+    assert fmt in FORMATS, f"Unknown format {fmt}"
+    s = np.asarray(s)
+    if s.ndim == 1:
+        s = s.reshape(-1, 1, 1)
+    ports = s.shape[-1]
+    if ports == 2:
+        s = s.transpose(0, 2, 1)
+    a, b = _from_complex(s.reshape(len(s), -1), fmt)
+
+    table = np.empty((len(s), 1 + 2 * ports * ports))
+    table[:, 0] = np.asarray(frequency) / FREQUENCY_UNITS[unit]
+    table[:, 1::2] = a
+    table[:, 2::2] = b
+
+    header = "".join(f"! {line}\n" for line in comment.splitlines()) if comment else ""
+    header += f"# {unit} S {fmt} R {z0:g}"
+    if ports <= 2:
+        np.savetxt(path, table, fmt="%.12g", header=header, comments="")
+        return
+    # more than 2 ports: one matrix row per line, at most 4 pairs per line
+    with open(path, "w") as f:
+        f.write(header + "\n")
+        for row in table:
+            pairs = row[1:].reshape(ports, ports * 2)
+            f.write(f"{row[0]:.12g}")
+            for r in pairs:
+                for start in range(0, ports * 2, 8):
+                    f.write(" " + " ".join(f"{v:.12g}" for v in r[start:start + 8]) + "\n")
+
+
+def read_one_port(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """(frequency, sm11) of a ``.s1p`` file, as used by OnePortCalibration"""
+    frequency, s, _ = read_touchstone(path, ports=1)
+    return frequency, s[:, 0, 0]
+
+
+def read_two_port(path: str) -> Tuple[np.ndarray, dict]:
+    """(frequency, {"sm11", "sm22", "sm12", "sm21"}) of a ``.s2p`` file"""
+    frequency, s, _ = read_touchstone(path, ports=2)
+    return frequency, {
+        "sm11": s[:, 0, 0],
+        "sm22": s[:, 1, 1],
+        "sm12": s[:, 0, 1],
+        "sm21": s[:, 1, 0],
+    }
+
+
+def read_sweep(path: str) -> Sweep:
+    """Sweep of a ``.s2p`` file, the parsed (N, 2, 2) array is used without copying"""
+    frequency, s, _ = read_touchstone(path, ports=2)
+    return Sweep(s, frequency)
+
+
+def write_sweep(path: str, sweep: Sweep, **kwargs):
+    """Write a Sweep with a frequency axis as ``.s2p``, kwargs as in write_touchstone"""
+    assert sweep.frequency is not None, "Sweep has no frequency axis"
+    write_touchstone(path, sweep.frequency, sweep.data, **kwargs)
+
+
+def write_two_port(path: str, frequency, s11, s22, s12, s21, **kwargs):
+    """Write corrected two port results, e.g. from TwoPortCalibration.correct()"""
+    s = np.empty((len(frequency), 2, 2), dtype=complex)
+    s[:, 0, 0] = s11
+    s[:, 1, 1] = s22
+    s[:, 0, 1] = s12
+    s[:, 1, 0] = s21
+    write_touchstone(path, frequency, s, **kwargs)
+
+
+def load_two_port_cals_touchstone(
+    open_path: str,
+    short_path: str,
+    load_path: str,
+    through_path: str,
+    s11_load=0.01,
+    s11_open=0.99,
+    s11_short=-0.99,
+    kit=None,
+):
+    """Touchstone counterpart of ``load_two_port_cals``, each standard is a ``.s2p`` file
+
+    :param kit - optional CalibrationKit evaluated on the file frequencies,
+        replaces s11_load / s11_open / s11_short
+    :return (TwoPortCalibration, standards dict, frequency)
+    """
+    frequency, open_s = read_two_port(open_path)
+    _, short_s = read_two_port(short_path)
+    _, load_s = read_two_port(load_path)
+    _, throw_s = read_two_port(through_path)
+    standards = {
+        "load_sm11": load_s["sm11"],
+        "load_sm22": load_s["sm22"],
+        "load_sm12": load_s["sm12"],
+        "load_sm21": load_s["sm21"],
+        "open_sm11": open_s["sm11"],
+        "open_sm22": open_s["sm22"],
+        "short_sm11": short_s["sm11"],
+        "short_sm22": short_s["sm22"],
+        "throw_sm11": throw_s["sm11"],
+        "throw_sm22": throw_s["sm22"],
+        "throw_sm12": throw_s["sm12"],
+        "throw_sm21": throw_s["sm21"],
+    }
+    if kit is not None:
+        ideal = kit.evaluate(frequency)
+        s11_load, s11_open, s11_short = ideal["s11_load"], ideal["s11_open"], ideal["s11_short"]
+    two_cal = TwoPortCalibration(
+        **standards, s11_load=s11_load, s11_open=s11_open, s11_short=s11_short
+    )
+    two_cal.calibrate()
+    return two_cal, standards, frequency
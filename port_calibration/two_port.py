@@ -1,10 +1,80 @@
 import numpy as np
 
-from port_calibration import OnePortCalibration
+from .one_port import OnePortCalibration
+from .instrumentation import span
+from .sweep import Sweep
+
+
+# Calibration steps in execution order
+STEPS = ("step_1_p1", "step_1_p2", "step_2", "step_3_p1", "step_3_p2")
+
+# Step -> earlier steps whose error terms it reads
+READS = {"step_3_p1": ("step_1_p1",), "step_3_p2": ("step_1_p2",)}
+
+# Standard / ideal value -> steps whose error terms depend on it
+DEPENDENCIES = {
+    "open_sm11": ("step_1_p1", "step_3_p1"),
+    "short_sm11": ("step_1_p1", "step_3_p1"),
+    "load_sm11": ("step_1_p1", "step_3_p1"),
+    "open_sm22": ("step_1_p2", "step_3_p2"),
+    "short_sm22": ("step_1_p2", "step_3_p2"),
+    "load_sm22": ("step_1_p2", "step_3_p2"),
+    "load_sm21": ("step_2", "step_3_p1"),
+    "load_sm12": ("step_2", "step_3_p2"),
+    "throw_sm11": ("step_3_p1",),
+    "throw_sm21": ("step_3_p1",),
+    "throw_sm22": ("step_3_p2",),
+    "throw_sm12": ("step_3_p2",),
+    "s11_load": ("step_1_p1", "step_1_p2", "step_3_p1", "step_3_p2"),
+    "s11_open": ("step_1_p1", "step_1_p2", "step_3_p1", "step_3_p2"),
+    "s11_short": ("step_1_p1", "step_1_p2", "step_3_p1", "step_3_p2"),
+}
+
+# Error term attributes, in cals() order
+TERMS = (
+    "e00",
+    "e11",
+    "e10e01",
+    "e30",
+    "e22",
+    "e10e32",
+    "e33_r",
+    "e22_r",
+    "e23e32_r",
+    "e03_r",
+    "e11_r",
+    "e23e01_r",
+)
+
+# Coefficients of correct() that are computed from the error terms by precompute()
+DERIVED_COEFFS = (
+    "inv_e10e01",
+    "inv_e23e32_r",
+    "inv_e10e32",
+    "inv_e23e01_r",
+    "e22e11_r",
+    "e22_r-e22",
+    "e11-e11_r",
+)
 
 
 class TwoPortCalibration:
-    """Two port calibration based on TOSL (Through, Open, Short, Load/Match) calibration"""
+    """Two port calibration based on TOSL (Through, Open, Short, Load/Match) calibration
+
+    With ``dtype=np.complex64`` the solve still runs in complex128, then the error
+    terms and correction coefficients are stored in single precision, which halves
+    their memory and the traffic of correct(). recalibrate() does not solve from
+    the rounded terms: step 3 re-derives the step 1 terms it reads from the
+    standards, so a new thru also re-runs the one port solve of its port.
+    correct() returns complex64 for complex64 and complex128 measurements alike,
+    unless ``out`` arrays of another dtype are given.
+    Accuracy relative to complex128, for passive DUTs (|S| <= 1) and typical VNA
+    error terms (|E11|, |E22| <= 0.2, tracking near 1):
+        |S_64 - S_128| <= 16 * eps * (1 + |S|) / |D|,  eps = 2**-24, D = calc_D()
+    that is at most 1.9e-6 / |D|. These assumptions keep |D| >= 0.6, so the error
+    stays below 3.2e-6. It degrades as |D| -> 0, where the correction itself is
+    ill conditioned, and for strongly active or mismatched data.
+    """
 
     def __init__(
         self,
@@ -23,6 +93,7 @@ class TwoPortCalibration:
         s11_load=0,
         s11_open=1,
         s11_short=-1,
+        dtype=complex,
     ):
         self.load_sm11 = load_sm11
         self.load_sm22 = load_sm22
@@ -44,6 +115,9 @@ class TwoPortCalibration:
         self.s11_open = s11_open
         self.s11_short = s11_short
 
+        # dtype of the stored error terms and of correct(), the solve runs in complex128
+        self.dtype = np.dtype(dtype)
+
         # forward
         self.e00 = 0
         self.e11 = 0
@@ -60,6 +134,12 @@ class TwoPortCalibration:
         self.e11_r = 0
         self.e23e01_r = 0
 
+        # steps whose error terms are out of date
+        self.stale = set(STEPS)
+
+        # correction coefficients, filled by precompute()
+        self._coeffs = None
+
     def cals(self):
         return {
             "E00": self.e00,  # D
@@ -76,35 +156,93 @@ class TwoPortCalibration:
             "E23'E01'": self.e23e01_r,
         }
 
-    def _step_1(self):
-        """STEP 1: One port calibration for P1 and P2 (open, short, load)"""
+    @classmethod
+    def from_cals(
+        cls, cals: dict, s11_load=0, s11_open=1, s11_short=-1, derived: dict = None, dtype=None
+    ):
+        """Calibration ready for correction from stored error terms, without standards
 
-        # P1 forward
-        p1 = OnePortCalibration(
-            sm11_open=self.open_sm11,
-            sm11_short=self.short_sm11,
-            sm11_load=self.load_sm11,
-            s11_short=self.s11_short,
-            s11_open=self.s11_open,
-            s11_load=self.s11_load,
+        :param dtype - dtype of the stored terms and corrections, by default that of ``cals``
+        """
+        if dtype is None:
+            dtype = np.result_type(*cals.values(), 1j)
+        cal = cls(
+            *([None] * 12),
+            s11_load=s11_load,
+            s11_open=s11_open,
+            s11_short=s11_short,
+            dtype=dtype,
         )
-        p1.calculate_calibration()
-        self.e00 = p1.cals["D"]
-        self.e11 = p1.cals["S"]
-        self.e10e01 = p1.cals["R"]
-
-        p2 = OnePortCalibration(
-            sm11_open=self.open_sm22,
-            sm11_short=self.short_sm22,
-            sm11_load=self.load_sm22,
+        cal.set_cals(cals, derived)
+        return cal
+
+    @classmethod
+    def from_sweeps(
+        cls, open, short, load, through, s11_load=0, s11_open=1, s11_short=-1, dtype=complex
+    ):
+        """Calibration on views into the four standard Sweeps, no data is copied"""
+        return cls(
+            *load.params(),
+            open.s11,
+            open.s22,
+            short.s11,
+            short.s22,
+            *through.params(),
+            s11_load=s11_load,
+            s11_open=s11_open,
+            s11_short=s11_short,
+            dtype=dtype,
+        )
+
+    def set_cals(self, cals: dict, derived: dict = None):
+        """Set solved error terms (as returned by cals()) without running calibrate()
+
+        :param derived - Stored DERIVED_COEFFS arrays, computed when not given
+        """
+        self.e00 = cals["E00"]
+        self.e11 = cals["E11"]
+        self.e10e01 = cals["E10E01"]
+        self.e30 = cals["E30"]
+        self.e22 = cals["E22"]
+        self.e10e32 = cals["E10E32"]
+        self.e33_r = cals["E33'"]
+        self.e22_r = cals["E22'"]
+        self.e23e32_r = cals["E23'E32'"]
+        self.e03_r = cals["E03'"]
+        self.e11_r = cals["E11'"]
+        self.e23e01_r = cals["E23'E01'"]
+        self.stale.clear()
+        self.precompute(derived)
+
+    def _one_port(self, sm11_open, sm11_short, sm11_load):
+        cal = OnePortCalibration(
+            sm11_open=sm11_open,
+            sm11_short=sm11_short,
+            sm11_load=sm11_load,
             s11_short=self.s11_short,
             s11_open=self.s11_open,
             s11_load=self.s11_load,
         )
-        p2.calculate_calibration()
-        self.e33_r = p2.cals["D"]
-        self.e22_r = p2.cals["S"]
-        self.e23e32_r = p2.cals["R"]
+        cal.calculate_calibration()
+        return cal.cals
+
+    def _step_1(self):
+        """STEP 1: One port calibration for P1 and P2 (open, short, load)"""
+        self._step_1_p1()
+        self._step_1_p2()
+
+    def _step_1_p1(self):
+        # P1 forward
+        cals = self._one_port(self.open_sm11, self.short_sm11, self.load_sm11)
+        self.e00 = cals["D"]
+        self.e11 = cals["S"]
+        self.e10e01 = cals["R"]
+
+    def _step_1_p2(self):
+        cals = self._one_port(self.open_sm22, self.short_sm22, self.load_sm22)
+        self.e33_r = cals["D"]
+        self.e22_r = cals["S"]
+        self.e23e32_r = cals["R"]
 
     def _step_2(self):
         """STEP 2: Connect 50 Ohm to P1 and P2"""
@@ -116,17 +254,18 @@ class TwoPortCalibration:
         # P2: sm12 = e03_r
         # self.e03_r = self.load_sm12
         self.e30 = np.zeros_like(self.load_sm21)
-        
 
     def _step_3(self):
         """STEP 3: Throw calibration"""
+        self._step_3_p1()
+        self._step_3_p2()
 
-        # P1
+    def _step_3_p1(self):
         delta_e = self.e00 * self.e11 - self.e10e01
         self.e22 = (self.throw_sm11 - self.e00) / (self.throw_sm11 * self.e11 - delta_e)
         self.e10e32 = (self.throw_sm21 - self.e30) * (1 - self.e11 * self.e22)
 
-        # P2
+    def _step_3_p2(self):
         delta_e_r = self.e33_r * self.e22_r - self.e23e32_r
         e11_r = (self.throw_sm22 - self.e33_r) / (
             self.throw_sm22 * self.e22_r - delta_e_r
@@ -135,9 +274,113 @@ class TwoPortCalibration:
         self.e23e01_r = (self.throw_sm12 - self.e03_r) * (1 - self.e22_r * e11_r)
 
     def calibrate(self):
-        self._step_1()
-        self._step_2()
-        self._step_3()
+        points = np.size(self.load_sm11)
+        with span("two_port.step_1", points):
+            self._step_1()
+        with span("two_port.step_2", points):
+            self._step_2()
+        with span("two_port.step_3", points):
+            self._step_3()
+        self.stale.clear()
+        self.precompute()
+
+    def update(self, **standards):
+        """Replace standards or ideal values (e.g. ``throw_sm21=...``) and mark
+        the error terms depending on them as stale, see recalibrate()"""
+        for name, value in standards.items():
+            assert name in DEPENDENCIES, f"Unknown standard {name}"
+            setattr(self, name, value)
+            self.stale.update(DEPENDENCIES[name])
+
+    def _can_run(self, step: str) -> bool:
+        """True if every standard ``step`` solves from is set, False after from_cals()"""
+        names = [name for name, steps in DEPENDENCIES.items() if step in steps]
+        return all(getattr(self, name) is not None for name in names)
+
+    def recalibrate(self):
+        """Re-run only the stale steps, e.g. a new thru re-solves step 3 alone"""
+        if not self.stale:
+            return
+        steps = set(self.stale)
+        if self.dtype.itemsize < np.dtype(complex).itemsize:
+            # stored terms are rounded, re-derive the ones read from the standards
+            for step in self.stale:
+                steps.update(s for s in READS.get(step, ()) if self._can_run(s))
+        points = np.size(self.load_sm11)
+        for step in STEPS:
+            if step in steps:
+                with span(f"two_port.{step}", points):
+                    getattr(self, f"_{step}")()
+        self.stale.clear()
+        self.precompute()
+
+    def precompute(self, derived: dict = None):
+        """Cache reciprocal tracking terms and products used by correct()
+
+        Derived coefficients are computed before the error terms are cast to ``dtype``,
+        the coefficients of correct() then share memory with the stored terms.
+
+        :param derived - Already computed DERIVED_COEFFS arrays, e.g. from shared memory
+        """
+        if derived is None:
+            derived = {
+                "inv_e10e01": 1 / np.asarray(self.e10e01),
+                "inv_e23e32_r": 1 / np.asarray(self.e23e32_r),
+                "inv_e10e32": 1 / np.asarray(self.e10e32),
+                "inv_e23e01_r": 1 / np.asarray(self.e23e01_r),
+                "e22e11_r": np.asarray(self.e22 * self.e11_r),
+                "e22_r-e22": np.asarray(self.e22_r - self.e22),
+                "e11-e11_r": np.asarray(self.e11 - self.e11_r),
+            }
+        for name in TERMS:
+            # asanyarray keeps memory mapped terms of the right dtype mapped
+            setattr(self, name, np.asanyarray(getattr(self, name), dtype=self.dtype))
+        self._coeffs = {
+            name: getattr(self, name)
+            for name in ("e00", "e33_r", "e30", "e03_r", "e11", "e22_r", "e11_r", "e22")
+        }
+        for key in DERIVED_COEFFS:
+            self._coeffs[key] = np.asarray(derived[key], dtype=self.dtype)
+
+    def workspace(self, shape) -> list:
+        """Scratch arrays for ``correct(..., workspace=...)`` on measurements of ``shape``"""
+        return [np.empty(shape, dtype=_dtype(self._coeffs)) for _ in range(6)]
+
+    def correct(self, sm11, sm22, sm12, sm21, out=None, workspace=None):
+        """Corrected (S11, S22, S12, S21) in a single pass.
+
+        D and the normalized measurements are computed once and shared between
+        all four S-parameters. Requires calibrate() (or precompute()) first.
+        Without ``out`` and ``workspace`` every call allocates its own buffers,
+        so one calibration can correct from several threads at once.
+
+        :param out - optional tuple of four preallocated arrays for S11, S22, S12, S21
+        :param workspace - optional six scratch arrays from workspace(); together with
+            ``out`` this makes repeated calls allocation free. Buffers must not be shared
+            between concurrent calls.
+        """
+        assert self._coeffs is not None, "Call calibrate() before correct()!"
+        with span("two_port.correct", np.size(sm11)):
+            return _correct(self._coeffs, sm11, sm22, sm12, sm21, out, workspace)
+
+    def correct_sweep(self, sweep: Sweep, out: Sweep = None) -> Sweep:
+        """correct() of a raw Sweep, results are written into the views of ``out``"""
+        if out is None:
+            out = Sweep.empty_like(sweep)
+        self.correct(*sweep.params(), out=out.params())
+        return out
+
+    def predict(self, s11, s22, s12, s21):
+        """Raw readings (Sm11, Sm22, Sm12, Sm21) of a DUT with actual S-parameters, the
+        forward and reverse 12-term models, i.e. the inverse of correct()"""
+        delta = s11 * s22 - s12 * s21
+        d_forward = 1 - self.e11 * s11 - self.e22 * s22 + self.e11 * self.e22 * delta
+        d_reverse = 1 - self.e11_r * s11 - self.e22_r * s22 + self.e11_r * self.e22_r * delta
+        sm11 = self.e00 + self.e10e01 * (s11 - self.e22 * delta) / d_forward
+        sm21 = self.e30 + self.e10e32 * s21 / d_forward
+        sm22 = self.e33_r + self.e23e32_r * (s22 - self.e11_r * delta) / d_reverse
+        sm12 = self.e03_r + self.e23e01_r * s12 / d_reverse
+        return sm11, sm22, sm12, sm21
 
     def calc_D(self, sm11, sm22, sm12, sm21):
         a = 1 + self.e11 * (sm11 - self.e00) / self.e10e01
@@ -151,6 +394,10 @@ class TwoPortCalibration:
         return a * b - c
 
     def calc_S11(self, sm11, sm22, sm12, sm21):
+        with span("two_port.calc_S11", np.size(sm11)):
+            return self._calc_S11(sm11, sm22, sm12, sm21)
+
+    def _calc_S11(self, sm11, sm22, sm12, sm21):
         D = self.calc_D(sm11, sm22, sm12, sm21)
         a = (sm11 - self.e00) / self.e10e01
         b = 1 + self.e22_r * (sm22 - self.e33_r) / self.e23e32_r
@@ -162,12 +409,20 @@ class TwoPortCalibration:
         return (a * b - c) / D
 
     def calc_S21(self, sm11, sm22, sm12, sm21):
+        with span("two_port.calc_S21", np.size(sm11)):
+            return self._calc_S21(sm11, sm22, sm12, sm21)
+
+    def _calc_S21(self, sm11, sm22, sm12, sm21):
         D = self.calc_D(sm11, sm22, sm12, sm21)
         a = (sm21 - self.e30) / self.e10e32
         b = 1 + (self.e22_r - self.e22) * (sm22 - self.e33_r) / self.e23e32_r
         return a * b / D
 
     def calc_S22(self, sm11, sm22, sm12, sm21):
+        with span("two_port.calc_S22", np.size(sm11)):
+            return self._calc_S22(sm11, sm22, sm12, sm21)
+
+    def _calc_S22(self, sm11, sm22, sm12, sm21):
         D = self.calc_D(sm11, sm22, sm12, sm21)
         a = (sm22 - self.e33_r) / self.e23e32_r
         b = 1 + self.e11 * (sm11 - self.e00) / self.e10e01
@@ -179,7 +434,79 @@ class TwoPortCalibration:
         return (a * b - c) / D
 
     def calc_S12(self, sm11, sm22, sm12, sm21):
+        with span("two_port.calc_S12", np.size(sm11)):
+            return self._calc_S12(sm11, sm22, sm12, sm21)
+
+    def _calc_S12(self, sm11, sm22, sm12, sm21):
         D = self.calc_D(sm11, sm22, sm12, sm21)
         a = (sm12 - self.e03_r) / self.e23e01_r
         b = 1 + (self.e11 - self.e11_r) * (sm11 - self.e00) / self.e10e01
         return a * b / D
+
+
+def _dtype(c) -> np.dtype:
+    # the coefficients set the precision, complex64 terms give complex64 results
+    return np.result_type(c["e00"], c["inv_e10e01"], 1j)
+
+
+def _correct(c, sm11, sm22, sm12, sm21, out=None, workspace=None):
+    """Fused 12-term correction with coefficients ``c`` from precompute()"""
+    shape = np.broadcast_shapes(
+        np.shape(sm11), np.shape(sm22), np.shape(sm12), np.shape(sm21), c["e00"].shape
+    )
+    dtype = _dtype(c)
+    if out is None:
+        out = tuple(np.empty(shape, dtype=dtype) for _ in range(4))
+    if workspace is None:
+        workspace = [np.empty(shape, dtype=dtype) for _ in range(6)]
+    s11, s22, s12, s21 = out
+    n11, n22, n12, n21, p, t = workspace
+
+    # normalized measurements
+    np.subtract(sm11, c["e00"], out=n11)
+    np.multiply(n11, c["inv_e10e01"], out=n11)
+    np.subtract(sm22, c["e33_r"], out=n22)
+    np.multiply(n22, c["inv_e23e32_r"], out=n22)
+    np.subtract(sm12, c["e03_r"], out=n12)
+    np.multiply(n12, c["inv_e23e01_r"], out=n12)
+    np.subtract(sm21, c["e30"], out=n21)
+    np.multiply(n21, c["inv_e10e32"], out=n21)
+    np.multiply(n21, n12, out=p)
+
+    # a = 1 + e11 * n11 -> s12, b = 1 + e22_r * n22 -> s21
+    np.multiply(c["e11"], n11, out=s12)
+    np.add(s12, 1, out=s12)
+    np.multiply(c["e22_r"], n22, out=s21)
+    np.add(s21, 1, out=s21)
+
+    # 1 / D = 1 / (a * b - e22 * e11_r * p) -> t
+    np.multiply(s12, s21, out=t)
+    np.multiply(c["e22e11_r"], p, out=s11)
+    np.subtract(t, s11, out=t)
+    np.divide(1, t, out=t)
+
+    # S11 = (n11 * b - e22 * p) / D
+    np.multiply(n11, s21, out=s11)
+    np.multiply(c["e22"], p, out=s21)
+    np.subtract(s11, s21, out=s11)
+    np.multiply(s11, t, out=s11)
+
+    # S22 = (n22 * a - e11_r * p) / D
+    np.multiply(n22, s12, out=s22)
+    np.multiply(c["e11_r"], p, out=s12)
+    np.subtract(s22, s12, out=s22)
+    np.multiply(s22, t, out=s22)
+
+    # S21 = n21 * (1 + (e22_r - e22) * n22) / D
+    np.multiply(c["e22_r-e22"], n22, out=s21)
+    np.add(s21, 1, out=s21)
+    np.multiply(s21, n21, out=s21)
+    np.multiply(s21, t, out=s21)
+
+    # S12 = n12 * (1 + (e11 - e11_r) * n11) / D
+    np.multiply(c["e11-e11_r"], n11, out=s12)
+    np.add(s12, 1, out=s12)
+    np.multiply(s12, n12, out=s12)
+    np.multiply(s12, t, out=s12)
+
+    return s11, s22, s12, s21
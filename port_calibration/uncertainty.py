@@ -0,0 +1,180 @@
+"""Monte Carlo uncertainty of TOSL error terms and corrected S-parameters.
+
+Perturbed copies of the standards and of the ideal kit values are drawn from
+the given distributions and solved as one batched TwoPortCalibration over
+(samples, N) arrays, a chunk of samples at a time. Per-point means and
+variances are folded into SweepAccumulator objects, so memory is bounded by
+the chunk size and not by the number of samples::
+
+    mc = MonteCarlo(
+        standards,
+        standard_noise={key: Normal(1e-3) for key in STANDARD_KEYS},
+        kit_noise={"s11_open": Normal(0.01, correlated=True)},
+    )
+    result = mc.run(samples=10000, dut=(sm11, sm22, sm12, sm21))
+    result.corrected["s21"].radius  # 95 % confidence radius per point
+
+Intervals are circles in the complex plane: for a circular gaussian the
+deviation |x - mean|^2 / variance is exponentially distributed, so the
+radius holding a fraction ``p`` of the samples is std * sqrt(-ln(1 - p)).
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from .averaging import SweepAccumulator
+from .instrumentation import span
+from .storage import CALS_KEYS
+from .two_port import TwoPortCalibration
+from .utils import STANDARD_KEYS
+
+KIT_KEYS = ("s11_load", "s11_open", "s11_short")
+DUT_KEYS = ("sm11", "sm22", "sm12", "sm21")
+
+
+@dataclass(frozen=True)
+class Normal:
+    """Additive complex gaussian, ``sigma`` per real and imaginary part"""
+
+    sigma: float
+    correlated: bool = False  # one draw per sample for all frequency points
+
+    def sample(self, rng, shape):
+        parts = rng.standard_normal(tuple(shape) + (2,))
+        parts *= self.sigma
+        return parts.view(complex)[..., 0]
+
+
+@dataclass(frozen=True)
+class Uniform:
+    """Additive complex uniform, real and imaginary parts in [-half_width, half_width]"""
+
+    half_width: float
+    correlated: bool = False
+
+    def sample(self, rng, shape):
+        w = self.half_width
+        return rng.uniform(-w, w, size=tuple(shape) + (2,)).view(complex)[..., 0]
+
+
+@dataclass(frozen=True)
+class Interval:
+    mean: np.ndarray
+    std: np.ndarray  # sqrt(E|x - mean|^2)
+    radius: np.ndarray  # confidence radius around mean
+
+    def magnitude(self):
+        """(lower, upper) bounds of |x|"""
+        magnitude = np.abs(self.mean)
+        return np.maximum(magnitude - self.radius, 0), magnitude + self.radius
+
+
+@dataclass(frozen=True)
+class UncertaintyResult:
+    samples: int
+    confidence: float
+    terms: dict = field(default_factory=dict)  # CALS_KEYS -> Interval
+    corrected: dict = field(default_factory=dict)  # s11, s22, s12, s21 -> Interval
+
+
+class MonteCarlo:
+    """Batched Monte Carlo propagation through TwoPortCalibration"""
+
+    def __init__(
+        self,
+        standards: dict,
+        s11_load=0.01,
+        s11_open=0.99,
+        s11_short=-0.99,
+        standard_noise: Optional[dict] = None,
+        kit_noise: Optional[dict] = None,
+        dut_noise: Optional[dict] = None,
+        seed: int = 0,
+    ):
+        """
+        :param standards - Measured standards, keys as in ``load_two_port_cals``
+        :param s11_load, s11_open, s11_short - Nominal ideal reflections, scalars or per point
+        :param standard_noise - {standard key: distribution} added to the measurements
+        :param kit_noise - {"s11_open"/"s11_short"/"s11_load": distribution} of the kit values
+        :param dut_noise - {"sm11"/...: distribution} added to the DUT measurement in run()
+        """
+        self.standards = {key: np.asarray(standards[key]) for key in STANDARD_KEYS}
+        self.points = np.broadcast_shapes(*(v.shape for v in self.standards.values()))[-1]
+        self.kit = {"s11_load": s11_load, "s11_open": s11_open, "s11_short": s11_short}
+        self.standard_noise = dict(standard_noise or {})
+        self.kit_noise = dict(kit_noise or {})
+        self.dut_noise = dict(dut_noise or {})
+        unknown = set(self.standard_noise) - set(STANDARD_KEYS)
+        unknown |= set(self.kit_noise) - set(KIT_KEYS)
+        unknown |= set(self.dut_noise) - set(DUT_KEYS)
+        assert not unknown, f"Unknown keys {sorted(unknown)}"
+        self.rng = np.random.default_rng(seed)
+
+    def _perturb(self, nominal, distribution, samples: int):
+        if distribution is None:
+            return nominal
+        shape = (samples, 1) if distribution.correlated else (samples, self.points)
+        return nominal + distribution.sample(self.rng, shape)
+
+    def calibration(self, samples: int) -> TwoPortCalibration:
+        """One solved TwoPortCalibration over (samples, N) perturbed inputs"""
+        standards = {
+            key: self._perturb(value, self.standard_noise.get(key), samples)
+            for key, value in self.standards.items()
+        }
+        kit = {
+            key: self._perturb(np.asarray(value), self.kit_noise.get(key), samples)
+            for key, value in self.kit.items()
+        }
+        cal = TwoPortCalibration(**standards, **kit)
+        cal.calibrate()
+        return cal
+
+    def run(
+        self,
+        samples: int = 1000,
+        dut=None,
+        chunk_size: int = 256,
+        confidence: float = 0.95,
+    ) -> UncertaintyResult:
+        """Intervals of the error terms and, with ``dut``, of its corrected S-parameters.
+
+        :param dut - Raw DUT measurement (sm11, sm22, sm12, sm21)
+        :param chunk_size - Samples solved per batch, bounds memory to chunk_size * N per array
+        :param confidence - Fraction of samples inside the interval radius
+        """
+        assert samples >= 2, "At least two samples are needed"
+        assert 0 < confidence < 1, "Confidence must be between 0 and 1"
+        terms = {key: SweepAccumulator() for key in CALS_KEYS}
+        corrected = {key: SweepAccumulator() for key in ("s11", "s22", "s12", "s21")}
+        if dut is not None:
+            dut = dict(zip(DUT_KEYS, (np.asarray(sm) for sm in dut)))
+
+        with span("uncertainty.run", samples * self.points):
+            done = 0
+            while done < samples:
+                size = min(chunk_size, samples - done)
+                cal = self.calibration(size)
+                for key, value in cal.cals().items():
+                    terms[key].add_batch(np.broadcast_to(value, (size, self.points)))
+                if dut is not None:
+                    sm = [self._perturb(dut[k], self.dut_noise.get(k), size) for k in DUT_KEYS]
+                    for key, value in zip(corrected, cal.correct(*sm)):
+                        corrected[key].add_batch(np.broadcast_to(value, (size, self.points)))
+                done += size
+
+        scale = np.sqrt(-np.log(1 - confidence))
+        return UncertaintyResult(
+            samples=samples,
+            confidence=confidence,
+            terms={key: _interval(acc, scale) for key, acc in terms.items()},
+            corrected={
+                key: _interval(acc, scale) for key, acc in corrected.items() if acc.count
+            },
+        )
+
+
+def _interval(acc: SweepAccumulator, scale: float) -> Interval:
+    std = np.sqrt(acc.variance())
+    return Interval(mean=acc.mean, std=std, radius=scale * std)
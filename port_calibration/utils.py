@@ -1,14 +1,158 @@
 import json
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
 
+from .instrumentation import span
+from .sweep import Sweep
 from .two_port import TwoPortCalibration
 
 
+# Standard key -> (standard directory, file name), in TwoPortCalibration argument order
+STANDARD_FILES = {
+    "load_sm11": ("load", "s11.json"),
+    "load_sm22": ("load", "s22.json"),
+    "load_sm12": ("load", "s12.json"),
+    "load_sm21": ("load", "s21.json"),
+    "open_sm11": ("open", "s11.json"),
+    "open_sm22": ("open", "s22.json"),
+    "short_sm11": ("short", "s11.json"),
+    "short_sm22": ("short", "s22.json"),
+    "throw_sm11": ("through", "s11.json"),
+    "throw_sm22": ("through", "s22.json"),
+    "throw_sm12": ("through", "s12.json"),
+    "throw_sm21": ("through", "s21.json"),
+}
+STANDARD_KEYS = tuple(STANDARD_FILES)
+
+
+class StandardsLoadError(Exception):
+    """One or more standard files failed to load, ``errors`` maps path -> exception"""
+
+    def __init__(self, errors: dict):
+        self.errors = errors
+        lines = [f"{path}: {type(exc).__name__}: {exc}" for path, exc in errors.items()]
+        super().__init__(
+            f"Failed to load {len(errors)} standard file(s):\n" + "\n".join(lines)
+        )
+
+
 def load_json_data(path: str) -> dict:
     with open(path, 'r') as f:
         return json.load(f)
-    
+
+
+def load_json_sparam(path: str) -> np.ndarray:
+    """Complex array from a ``{"data": {"real": [...], "imag": [...]}}`` file"""
+    raw = load_json_data(path)['data']
+    data = np.empty(len(raw['real']), dtype=complex)
+    data.real = raw['real']
+    data.imag = raw['imag']
+    return data
+
+
+# Standard directory -> parameters stored in it
+STANDARD_PARAMS = {
+    "open": ("s11", "s22"),
+    "short": ("s11", "s22"),
+    "load": ("s11", "s22", "s12", "s21"),
+    "through": ("s11", "s22", "s12", "s21"),
+}
+
+
+def load_json_sweep(directory: str, params=("s11", "s22", "s12", "s21")) -> Sweep:
+    """Sweep of the ``<param>.json`` files in ``directory``, filled in place.
+
+    Parameters not listed stay zero, e.g. the transmission of open and short.
+    """
+    raws = [load_json_data(f"{directory}/{param}.json")['data'] for param in params]
+    sweep = Sweep.empty(len(raws[0]['real']))
+    for param, raw in zip(params, raws):
+        view = getattr(sweep, param)
+        assert len(raw['real']) == len(view), f"{directory}/{param}.json: length mismatch"
+        view.real = raw['real']
+        view.imag = raw['imag']
+    return sweep
+
+
+def standard_paths(open_dir: str, short_dir: str, load_dir: str, through_dir: str) -> dict:
+    dirs = {"open": open_dir, "short": short_dir, "load": load_dir, "through": through_dir}
+    return {
+        key: f"{dirs[standard]}/{filename}"
+        for key, (standard, filename) in STANDARD_FILES.items()
+    }
+
+
+def _load_parallel(paths: dict, workers: int) -> dict:
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {key: pool.submit(load_json_sparam, path) for key, path in paths.items()}
+    result, errors = {}, {}
+    for key, future in futures.items():
+        exc = future.exception()
+        if exc is None:
+            result[key] = future.result()
+        else:
+            errors[paths[key]] = exc
+    if errors:
+        raise StandardsLoadError(errors)
+    return result
+
+
+def load_two_port_standards(
+    open_dir: str,
+    short_dir: str,
+    load_dir: str,
+    through_dir: str,
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    :param workers - read and parse the files concurrently with this many threads;
+        failures of all files are then reported together as StandardsLoadError
+    """
+    paths = standard_paths(open_dir, short_dir, load_dir, through_dir)
+    with span("load_standards") as timing:
+        if workers:
+            standards = _load_parallel(paths, workers)
+        else:
+            standards = {key: load_json_sparam(path) for key, path in paths.items()}
+        timing.points = len(standards["load_sm11"])
+    return standards
+
+
+def load_two_port_sweeps(
+    open_dir: str,
+    short_dir: str,
+    load_dir: str,
+    through_dir: str,
+    workers: Optional[int] = None,
+) -> dict:
+    """{"open", "short", "load", "through"} standard Sweeps, see TwoPortCalibration.from_sweeps
+
+    :param workers - read the four directories concurrently with this many threads;
+        failures are then reported together as StandardsLoadError
+    """
+    dirs = {"open": open_dir, "short": short_dir, "load": load_dir, "through": through_dir}
+    with span("load_standards") as timing:
+        if workers:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    name: pool.submit(load_json_sweep, path, STANDARD_PARAMS[name])
+                    for name, path in dirs.items()
+                }
+            errors = {dirs[n]: f.exception() for n, f in futures.items() if f.exception()}
+            if errors:
+                raise StandardsLoadError(errors)
+            sweeps = {name: future.result() for name, future in futures.items()}
+        else:
+            sweeps = {
+                name: load_json_sweep(path, STANDARD_PARAMS[name]) for name, path in dirs.items()
+            }
+        timing.points = len(sweeps["load"])
+    return sweeps
+
 
 def load_two_port_cals(
     open_dir: str,
@@ -17,70 +161,64 @@ def load_two_port_cals(
     through_dir: str,
     s11_load=0.01,
     s11_open=0.99,
-    s11_short=-0.99
+    s11_short=-0.99,
+    workers: Optional[int] = None,
+    cache=None,
+    dtype=complex,
 ) -> Tuple[TwoPortCalibration, dict]:
-    # open
-    open_raw_sm11 = load_json_data(f"{open_dir}/s11.json")['data']
-    open_sm11 = np.array(open_raw_sm11['real']) + np.array(open_raw_sm11['imag']) * 1j
-    open_raw_sm22 = load_json_data(f"{open_dir}/s22.json")['data']
-    open_sm22 = np.array(open_raw_sm22['real']) + np.array(open_raw_sm22['imag']) * 1j
-
-    # short
-    short_raw_sm11 = load_json_data(f"{short_dir}/s11.json")['data']
-    short_sm11 = np.array(short_raw_sm11['real']) + np.array(short_raw_sm11['imag']) * 1j
-    short_raw_sm22 = load_json_data(f"{short_dir}/s22.json")['data']
-    short_sm22 = np.array(short_raw_sm22['real']) + np.array(short_raw_sm22['imag']) * 1j
-
-    # load
-    load_raw_sm11 = load_json_data(f"{load_dir}/s11.json")['data']
-    load_sm11 = np.array(load_raw_sm11['real']) + np.array(load_raw_sm11['imag']) * 1j
-    load_raw_sm22 = load_json_data(f"{load_dir}/s22.json")['data']
-    load_sm22 = np.array(load_raw_sm22['real']) + np.array(load_raw_sm22['imag']) * 1j
-    load_raw_sm12 = load_json_data(f"{load_dir}/s12.json")['data']
-    load_sm12 = np.array(load_raw_sm12['real']) + np.array(load_raw_sm12['imag']) * 1j
-    load_raw_sm21 = load_json_data(f"{load_dir}/s21.json")['data']
-    load_sm21 = np.array(load_raw_sm21['real']) + np.array(load_raw_sm21['imag']) * 1j
-
-    # throw
-    throw_raw_sm11 = load_json_data(f"{through_dir}/s11.json")['data']
-    throw_sm11 = np.array(throw_raw_sm11['real']) + np.array(throw_raw_sm11['imag']) * 1j
-    throw_raw_sm22 = load_json_data(f"{through_dir}/s22.json")['data']
-    throw_sm22 = np.array(throw_raw_sm22['real']) + np.array(throw_raw_sm22['imag']) * 1j
-    throw_raw_sm12 = load_json_data(f"{through_dir}/s12.json")['data']
-    throw_sm12 = np.array(throw_raw_sm12['real']) + np.array(throw_raw_sm12['imag']) * 1j
-    throw_raw_sm21 = load_json_data(f"{through_dir}/s21.json")['data']
-    throw_sm21 = np.array(throw_raw_sm21['real']) + np.array(throw_raw_sm21['imag']) * 1j
-
-    two_cal = TwoPortCalibration(
-        load_sm11,
-        load_sm22,
-        load_sm12,
-        load_sm21,
-        open_sm11,
-        open_sm22,
-        short_sm11,
-        short_sm22,
-        throw_sm11,
-        throw_sm22,
-        throw_sm12,
-        throw_sm21,
-        s11_load=s11_load,
-        s11_open=s11_open,
-        s11_short=s11_short
+    """
+    :param cache - optional CalibrationCache; on a hit the stored standards and
+        error terms are used and neither the JSON parsing nor the solve is run
+    :param dtype - dtype of the error terms and corrections, e.g. np.complex64;
+        standards are parsed and solved in complex128, the cache holds complex128 terms
+    """
+    kit = {"s11_load": s11_load, "s11_open": s11_open, "s11_short": s11_short}
+    if cache is not None:
+        key = cache.key(
+            standard_paths(open_dir, short_dir, load_dir, through_dir),
+            s11_load,
+            s11_open,
+            s11_short,
+        )
+        hit = cache.get(key)
+        if hit is not None:
+            standards, cals = hit
+            two_cal = TwoPortCalibration(**standards, **kit, dtype=dtype)
+            two_cal.set_cals(cals)
+            return two_cal, _standards_result(standards)
+
+    standards = load_two_port_standards(
+        open_dir, short_dir, load_dir, through_dir, workers=workers
     )
-    two_cal.calibrate()
-
-    return two_cal, {
-        "open_sm11": open_sm11,
-        "open_sm22": open_sm22,
-        "short_sm11": short_sm11,
-        "short_sm22": short_sm22,
-        "load_sm11": load_sm11,
-        "load_sm22": load_sm22,
-        "load_sm12": load_sm12,
-        "load_sm21": load_sm21,
-        "throw_sm11": throw_sm11,
-        "throw_sm22": throw_sm22,
-        "throw_sm12": throw_sm12,
-        "throw_sm21": throw_sm21,
+
+    if cache is None:
+        two_cal = TwoPortCalibration(**standards, **kit, dtype=dtype)
+        two_cal.calibrate()
+    else:
+        # full precision terms are cached, reduced precision is applied on load
+        solved = TwoPortCalibration(**standards, **kit)
+        solved.calibrate()
+        cache.put(key, standards, solved.cals())
+        two_cal = solved
+        if np.dtype(dtype) != solved.dtype:
+            two_cal = TwoPortCalibration(**standards, **kit, dtype=dtype)
+            two_cal.set_cals(solved.cals())
+
+    return two_cal, _standards_result(standards)
+
+
+def _standards_result(standards: dict) -> dict:
+    return {
+        "open_sm11": standards["open_sm11"],
+        "open_sm22": standards["open_sm22"],
+        "short_sm11": standards["short_sm11"],
+        "short_sm22": standards["short_sm22"],
+        "load_sm11": standards["load_sm11"],
+        "load_sm22": standards["load_sm22"],
+        "load_sm12": standards["load_sm12"],
+        "load_sm21": standards["load_sm21"],
+        "throw_sm11": standards["throw_sm11"],
+        "throw_sm22": standards["throw_sm22"],
+        "throw_sm12": standards["throw_sm12"],
+        "throw_sm21": standards["throw_sm21"],
     }
@@ -19,4 +19,7 @@ setup(
     keywords="port calibration vna",
     packages=find_packages(),
     install_requires=["numpy"],
+    entry_points={
+        "console_scripts": ["port-cal=port_calibration.cli:main"],
+    },
 )
\ No newline at end of file
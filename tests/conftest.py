@@ -1,7 +1,46 @@
+import json
 import sys
 from pathlib import Path
 
-
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from port_calibration import TwoPortCalibration  # noqa: E402
+
+# Raw readings of typical TOSL standards, in STANDARD_KEYS order
+NOMINAL = {
+    "load_sm11": 0.01, "load_sm22": 0.01, "load_sm12": 0, "load_sm21": 0,
+    "open_sm11": 0.9, "open_sm22": 0.9, "short_sm11": -0.9, "short_sm22": -0.9,
+    "throw_sm11": 0, "throw_sm22": 0, "throw_sm12": 0.9, "throw_sm21": 0.9,
+}
+THRU_KEYS = ("throw_sm11", "throw_sm22", "throw_sm12", "throw_sm21")
+
+
+def cnoise(rng, scale, size):
+    """Complex gaussian, ``scale`` per real and imaginary part"""
+    return rng.normal(scale=scale, size=size) + 1j * rng.normal(scale=scale, size=size)
+
+
+def random_standards(rng, points, scale=0.05) -> dict:
+    """NOMINAL standards with complex noise, ``points`` may be a shape"""
+    return {key: value + cnoise(rng, scale, points) for key, value in NOMINAL.items()}
+
+
+def random_calibration(rng, points, **kwargs):
+    """Solved TwoPortCalibration of random_standards() and the standards it was solved from"""
+    standards = random_standards(rng, points)
+    cal = TwoPortCalibration(**standards, **kwargs)
+    cal.calibrate()
+    return cal, standards
+
+
+def write_json_dir(directory, params, rng, points, scale=1.0):
+    """``<param>.json`` files with random data in the loader's format"""
+    directory.mkdir(parents=True)
+    for param in params:
+        data = {
+            "real": rng.normal(scale=scale, size=points).tolist(),
+            "imag": rng.normal(scale=scale, size=points).tolist(),
+        }
+        (directory / f"{param}.json").write_text(json.dumps({"data": data}))
@@ -0,0 +1,36 @@
+import numpy as np
+
+from port_calibration.archive import SweepArchive
+
+
+def test_append_query_and_read_slices(tmp_path):
+    rng = np.random.default_rng(20)
+    frequency = np.linspace(1e9, 10e9, 91)
+    archive = SweepArchive(str(tmp_path), chunk_bytes=8 << 10)
+    sweeps = []
+    for i in range(12):
+        s = rng.normal(size=(4, 91)) + 1j * rng.normal(size=(4, 91))
+        cal_id = "cal-a" if i < 6 else "cal-b"
+        assert archive.append(frequency, tuple(s), timestamp=100.0 + i, cal_id=cal_id) == i
+        sweeps.append(s)
+    one_port = rng.normal(size=31) + 0j
+    archive.append(np.linspace(20e9, 23e9, 31), one_port, timestamp=200.0)
+
+    assert len(archive) == 13
+    assert len(list(tmp_path.glob("chunk_*.bin"))) > 1
+
+    np.testing.assert_array_equal(archive.query(start=103, stop=107.5), [3, 4, 5, 6, 7])
+    np.testing.assert_array_equal(archive.query(start=103, stop=107.5, cal_id="cal-b"), [6, 7])
+    np.testing.assert_array_equal(archive.query(f_min=15e9), [12])
+
+    found = list(archive.read(start=104, stop=105, f_min=5e9, f_max=6e9))
+    assert [int(r["timestamp"]) for r, _, _ in found] == [104, 105]
+    mask = (frequency >= 5e9) & (frequency <= 6e9)
+    for (record, f, s), expected in zip(found, sweeps[4:6]):
+        assert not s.flags.writeable and not s.flags.owndata
+        np.testing.assert_array_equal(f, frequency[mask])
+        np.testing.assert_array_equal(s, expected[:, mask])
+
+    f, s = archive.sweep(12)
+    assert s.shape == (1, 31)
+    np.testing.assert_array_equal(s[0], one_port)
@@ -0,0 +1,56 @@
+import numpy as np
+
+from conftest import NOMINAL
+from port_calibration import StandardsAccumulator, SweepAccumulator, TwoPortCalibration
+
+
+def _repeats(rng, count, points, center=0.5 + 0.2j):
+    return center + rng.normal(scale=0.01, size=(count, points)) + 1j * rng.normal(
+        scale=0.02, size=(count, points)
+    )
+
+
+def test_welford_mean_and_variance_match_numpy():
+    repeats = _repeats(np.random.default_rng(17), 25, 12)
+
+    acc = SweepAccumulator()
+    for sweep in repeats:
+        acc.add(sweep)
+    np.testing.assert_allclose(acc.mean, repeats.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(acc.variance(), repeats.var(axis=0, ddof=1), rtol=1e-9)
+    np.testing.assert_allclose(
+        acc.std_error(), np.sqrt(repeats.var(axis=0, ddof=1) / 25), rtol=1e-9
+    )
+
+    mixed = SweepAccumulator()
+    mixed.add_batch(repeats[:10])
+    for sweep in repeats[10:20]:
+        mixed.add(sweep)
+    mixed.add_batch(repeats[20:])
+    assert mixed.count == 25
+    np.testing.assert_allclose(mixed.mean, acc.mean, rtol=1e-12)
+    np.testing.assert_allclose(mixed.variance(), acc.variance(), rtol=1e-9)
+
+
+def test_standards_accumulator_feeds_the_mean_into_the_calibration():
+    rng = np.random.default_rng(18)
+    repeats = {key: _repeats(rng, 5, 8, center=v) for key, v in NOMINAL.items()}
+
+    acc = StandardsAccumulator()
+    for i in range(5):
+        acc.add_standards({key: value[i] for key, value in repeats.items()})
+    assert set(acc.counts().values()) == {5}
+
+    cal = acc.calibration()
+    expected = TwoPortCalibration(
+        **{key: value.mean(axis=0) for key, value in repeats.items()},
+        s11_load=0.01,
+        s11_open=0.99,
+        s11_short=-0.99,
+    )
+    expected.calibrate()
+    for key, value in expected.cals().items():
+        np.testing.assert_allclose(cal.cals()[key], value, rtol=1e-9)
+    np.testing.assert_allclose(
+        acc.variances()["throw_sm21"], repeats["throw_sm21"].var(axis=0, ddof=1), rtol=1e-9
+    )
@@ -0,0 +1,32 @@
+import numpy as np
+
+from conftest import random_standards
+from port_calibration import CalibrationSet, TwoPortCalibration
+
+
+def test_calibration_set_matches_per_channel_calibrations():
+    rng = np.random.default_rng(12)
+    channels, points = 5, 30
+    standards = [random_standards(rng, points) for _ in range(channels)]
+
+    cal_set = CalibrationSet.from_channels(standards)
+    cal_set.calibrate()
+    assert len(cal_set) == channels
+
+    sm = [
+        rng.normal(scale=0.3, size=(channels, points))
+        + 1j * rng.normal(scale=0.3, size=(channels, points))
+        for _ in range(4)
+    ]
+    corrected = cal_set.correct(*sm)
+
+    for i, channel in enumerate(standards):
+        cal = TwoPortCalibration(**channel, s11_load=0.01, s11_open=0.99, s11_short=-0.99)
+        cal.calibrate()
+        for key, value in cal.cals().items():
+            np.testing.assert_allclose(cal_set.cals()[key][i], value, rtol=1e-12)
+        expected = cal.correct(*(s[i] for s in sm))
+        for a, b in zip(corrected, expected):
+            np.testing.assert_allclose(a[i], b, rtol=1e-12)
+        for a, b in zip(cal_set.channel(i).correct(*(s[i] for s in sm)), expected):
+            np.testing.assert_allclose(a, b, rtol=1e-12)
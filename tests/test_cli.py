@@ -0,0 +1,74 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from conftest import write_json_dir
+from port_calibration import load_two_port_cals
+from port_calibration.cli import main
+from port_calibration.touchstone import read_touchstone, write_touchstone
+
+
+def _read_json(path):
+    data = json.loads(path.read_text())["data"]
+    return np.array(data["real"]) + 1j * np.array(data["imag"])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_solve_and_correct_directory_tree(tmp_path, capsys, workers):
+    rng = np.random.default_rng(19)
+    points = 12
+    for standard in ("open", "short"):
+        write_json_dir(tmp_path / standard, ("s11", "s22"), rng, points, scale=0.5)
+    for standard in ("load", "through"):
+        write_json_dir(tmp_path / standard, ("s11", "s22", "s12", "s21"), rng, points, scale=0.5)
+    dirs = [str(tmp_path / d) for d in ("open", "short", "load", "through")]
+    cal, _ = load_two_port_cals(*dirs)
+
+    cals = str(tmp_path / "cals.npy")
+    args = ["--open", dirs[0], "--short", dirs[1], "--load", dirs[2], "--through", dirs[3]]
+    assert main(["solve", *args, "-o", cals]) == 0
+
+    duts = tmp_path / "duts"
+    write_json_dir(duts / "a" / "dut1", ("s11", "s22", "s12", "s21"), rng, points, scale=0.5)
+    s = rng.normal(size=(points, 2, 2)) + 1j * rng.normal(size=(points, 2, 2))
+    (duts / "b").mkdir(parents=True)
+    write_touchstone(str(duts / "b" / "dut2.s2p"), np.linspace(1e9, 2e9, points), s)
+
+    assert main(["correct", str(duts), "--cals", cals, "--workers", str(workers)]) == 0
+    assert "Corrected 2 of 2 measurements" in capsys.readouterr().out
+
+    sm = [_read_json(duts / "a" / "dut1" / f"{p}.json") for p in ("s11", "s22", "s12", "s21")]
+    for p, expected in zip(("s11", "s22", "s12", "s21"), cal.correct(*sm)):
+        np.testing.assert_allclose(_read_json(duts / "a" / "dut1" / "corrected" / f"{p}.json"), expected)
+    _, corrected, _ = read_touchstone(str(duts / "b" / "dut2.corrected.s2p"))
+    s11, s22, s12, s21 = cal.correct(s[:, 0, 0], s[:, 1, 1], s[:, 0, 1], s[:, 1, 0])
+    np.testing.assert_allclose(corrected[:, 1, 0], s21, rtol=1e-9)
+
+    # solving in-process and writing to a separate tree, a second run skips corrected outputs
+    out = tmp_path / "out"
+    assert main(["correct", str(duts), *args, "-o", str(out), "--workers", "1"]) == 0
+    assert (out / "b" / "dut2.s2p").exists()
+    assert (out / "a" / "dut1" / "s21.json").exists()
+    assert "Corrected 2 of 2" in capsys.readouterr().out
+
+
+def test_cli_import_leaves_feature_modules_unloaded():
+    code = (
+        "import sys, port_calibration.cli; "
+        "print(' '.join(m for m in sys.modules if m.startswith('port_calibration.')))"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()
+    assert "port_calibration.two_port" in loaded
+    unused = ("storage", "touchstone", "shared", "library", "uncertainty", "time_domain")
+    for module in unused:
+        assert f"port_calibration.{module}" not in loaded
@@ -0,0 +1,50 @@
+import numpy as np
+
+from conftest import cnoise, random_calibration
+from port_calibration import OnePortCalibration
+from port_calibration.drift import check_one_port, check_two_port
+
+
+def test_predict_inverts_correct():
+    rng = np.random.default_rng(21)
+    cal, _ = random_calibration(rng, 30)
+    s = [cnoise(rng, 0.3, 30) for _ in range(4)]
+    for corrected, expected in zip(cal.correct(*cal.predict(*s)), s):
+        np.testing.assert_allclose(corrected, expected, rtol=1e-10, atol=1e-12)
+
+    one = OnePortCalibration(cal.open_sm11, cal.short_sm11, cal.load_sm11)
+    one.calculate_calibration()
+    np.testing.assert_allclose(one.calibrate_measure(one.predict(s[0])), s[0], rtol=1e-10)
+
+
+def test_two_port_thru_drift_fails_only_drifted_band():
+    rng = np.random.default_rng(22)
+    points = 100
+    frequency = np.linspace(1e9, 10e9, points)
+    cal, standards = random_calibration(rng, points)
+    thru = {key[6:]: standards[key] for key in standards if key.startswith("throw_")}
+    bands = [(1e9, 5e9), (5e9, 10e9)]
+
+    report = check_two_port(cal, thru, frequency=frequency, bands=bands, thresholds=1e-9)
+    assert report.passed
+    assert report.residual.shape == (points,)
+
+    drifted = dict(thru, sm21=thru["sm21"] * np.where(frequency > 6e9, 1.05, 1.0))
+    report = check_two_port(cal, drifted, frequency=frequency, bands=bands, thresholds=0.01)
+    assert not report.passed
+    np.testing.assert_array_equal(report.band_passed, [True, False])
+    assert report.failed_bands() == [(5e9, 10e9)]
+
+
+def test_one_port_load_drift():
+    rng = np.random.default_rng(23)
+    cal, standards = random_calibration(rng, 50)
+    one = OnePortCalibration(
+        standards["open_sm11"], standards["short_sm11"], standards["load_sm11"], s11_load=0.01
+    )
+    one.calculate_calibration()
+    load = standards["load_sm11"]
+    assert check_one_port(one, load, s11=0.01, thresholds=1e-9).passed
+    report = check_one_port(one, load + 0.02, s11=0.01, bands=[(0, 24), (25, 49)])
+    assert not report.band_passed.any()
+    np.testing.assert_allclose(report.max_residual, 0.02)
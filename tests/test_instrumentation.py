@@ -0,0 +1,79 @@
+import threading
+
+import numpy as np
+import pytest
+
+from conftest import THRU_KEYS, random_standards
+from port_calibration import TwoPortCalibration, instrumentation
+
+
+@pytest.fixture
+def enabled():
+    instrumentation.reset()
+    instrumentation.enable(track_memory=True)
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def _calibration(points):
+    standards = random_standards(np.random.default_rng(16), points)
+    return TwoPortCalibration(**standards), [standards[key] for key in THRU_KEYS]
+
+
+def test_spans_record_steps_solve_and_correction(enabled):
+    records = []
+    instrumentation.add_callback(records.append)
+    cal, thru = _calibration(1000)
+    cal.calibrate()
+    cal.correct(*thru)
+    instrumentation.remove_callback(records.append)
+
+    stats = instrumentation.stats()
+    for name in ("two_port.step_1", "two_port.step_2", "two_port.step_3", "two_port.correct"):
+        assert stats[name]["count"] == 1
+        assert stats[name]["points"] == 1000
+        assert stats[name]["total_time"] >= 0
+    assert stats["one_port.solve"]["count"] == 2
+    assert stats["one_port.solve"]["points"] == 2000
+    # the solve allocates the (N, 3, 3) system, nested inside step 1
+    assert stats["one_port.solve"]["peak_bytes"] >= 1000 * 9 * 16
+    assert stats["two_port.step_1"]["peak_bytes"] >= stats["one_port.solve"]["peak_bytes"]
+    assert [r["name"] for r in records][-1] == "two_port.correct"
+
+
+def test_disabled_instrumentation_records_nothing():
+    instrumentation.reset()
+    cal, thru = _calibration(10)
+    cal.calibrate()
+    cal.correct(*thru)
+    assert instrumentation.stats() == {}
+    assert instrumentation.span("x") is instrumentation.span("y")
+
+
+def test_memory_is_tracked_per_span_on_the_main_thread_only():
+    instrumentation.reset()
+    try:
+        # enabled while a span is open, that span keeps its untracked start
+        instrumentation.enable()
+        with instrumentation.span("outer"):
+            instrumentation.enable(track_memory=True)
+            with instrumentation.span("inner"):
+                np.ones(1000)
+        with instrumentation.span("main"):
+            worker = threading.Thread(target=_worker_span)
+            worker.start()
+            worker.join()
+    finally:
+        instrumentation.disable()
+    stats = instrumentation.stats()
+    instrumentation.reset()
+    assert stats["outer"]["peak_bytes"] is None
+    assert stats["inner"]["peak_bytes"] >= 8000
+    assert stats["main"]["peak_bytes"] is not None
+    assert stats["worker"]["peak_bytes"] is None and stats["worker"]["count"] == 1
+
+
+def _worker_span():
+    with instrumentation.span("worker"):
+        np.ones(1000)
@@ -0,0 +1,86 @@
+import numpy as np
+
+from port_calibration import TwoPortCalibration
+from port_calibration.interpolation import FrequencyCalibration
+from port_calibration.storage import CALS_KEYS
+
+
+def _linear_cals(frequency):
+    return {
+        key: (0.1 + 0.05j) * (i + 1) + (0.02 - 0.01j) * (i + 1) * frequency / 1e9
+        + (1 if key in ("E10E01", "E23'E32'", "E10E32", "E23'E01'") else 0)
+        for i, key in enumerate(CALS_KEYS)
+    }
+
+
+def test_linear_interpolation_is_exact_for_linear_terms_and_caches_weights():
+    f_cal = np.linspace(1e9, 10e9, 11)
+    f_target = np.linspace(1.5e9, 9.5e9, 101)
+    fcal = FrequencyCalibration(_linear_cals(f_cal), f_cal)
+
+    terms = fcal.interpolate(f_target)
+    expected = _linear_cals(f_target)
+    for key in CALS_KEYS:
+        np.testing.assert_allclose(terms[key], expected[key], rtol=1e-12)
+
+    assert fcal.weights(f_target.copy()) is fcal.weights(f_target)
+
+    on_grid = fcal.interpolate(f_cal)
+    for key, value in _linear_cals(f_cal).items():
+        np.testing.assert_allclose(on_grid[key], value, rtol=1e-12)
+
+    # outside the calibration axis the edge values are held
+    edges = fcal.interpolate(np.array([0.5e9, 11e9]))
+    np.testing.assert_allclose(edges["E00"], _linear_cals(f_cal[[0, -1]])["E00"])
+
+
+def test_magphase_interpolation_follows_phase_rotation_and_corrects():
+    f_cal = np.linspace(1e9, 2e9, 21)
+    f_target = np.linspace(1e9, 2e9, 77)
+    delay = 2e-9
+
+    def cals(f):
+        rotation = np.exp(-2j * np.pi * f * delay)
+        result = {key: np.zeros_like(rotation) for key in CALS_KEYS}
+        for key in ("E10E01", "E23'E32'", "E10E32", "E23'E01'"):
+            result[key] = 0.9 * rotation
+        return result
+
+    fcal = FrequencyCalibration(cals(f_cal), f_cal, method="magphase")
+    terms = fcal.interpolate(f_target)
+    np.testing.assert_allclose(terms["E10E32"], cals(f_target)["E10E32"], rtol=1e-9)
+
+    expected = TwoPortCalibration.from_cals(cals(f_target))
+    sm = [np.full(len(f_target), v) for v in (0.1, 0.2, 0.5j, 0.5)]
+    for a, b in zip(fcal.correct(f_target, *sm), expected.correct(*sm)):
+        np.testing.assert_allclose(a, b, rtol=1e-9, atol=1e-12)
+
+
+def test_correct_reuses_the_calibration_of_a_grid(monkeypatch):
+    f_cal = np.linspace(1e9, 10e9, 11)
+    f_target = np.linspace(1.5e9, 9.5e9, 101)
+    fcal = FrequencyCalibration(_linear_cals(f_cal), f_cal, max_calibrations=1)
+    built = []
+    from_cals = TwoPortCalibration.from_cals.__func__
+
+    def counting_from_cals(cls, cals, **kwargs):
+        built.append(len(cals))
+        return from_cals(cls, cals, **kwargs)
+
+    monkeypatch.setattr(TwoPortCalibration, "from_cals", classmethod(counting_from_cals))
+    sm = [np.full(len(f_target), v) for v in (0.1, 0.2, 0.5j, 0.5)]
+    first = fcal.correct(f_target, *sm)
+    cal = fcal.calibration(f_target.copy())
+    coeffs = cal._coeffs
+    second = fcal.correct(f_target, *sm)
+    assert len(built) == 1
+    assert cal._coeffs is coeffs
+    for a, b in zip(first, second):
+        np.testing.assert_array_equal(a, b)
+
+    # the calibration cache is bounded separately from the weights
+    fcal.correct(f_cal, *[v[: len(f_cal)] for v in sm])
+    assert list(fcal._calibrations) == [f_cal.tobytes()]
+    assert len(fcal._weights) == 2
+    assert fcal.calibration(f_target) is not cal
+    assert len(built) == 3
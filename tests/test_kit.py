@@ -0,0 +1,69 @@
+import numpy as np
+
+from port_calibration import (
+    CalibrationKit,
+    LoadStandard,
+    Offset,
+    OnePortCalibration,
+    OpenStandard,
+    ShortStandard,
+)
+
+
+def _measured_one_port(D, S, R, gamma):
+    return D + (R * gamma) / (1 - S * gamma)
+
+
+def test_ideal_kit_and_lumped_terminations():
+    f = np.linspace(0, 20e9, 21)
+    ideal = CalibrationKit().evaluate(f)
+    np.testing.assert_allclose(ideal["s11_open"], 1)
+    np.testing.assert_allclose(ideal["s11_short"], -1)
+    np.testing.assert_allclose(ideal["s11_load"], 0, atol=1e-15)
+
+    c0, l0 = 50e-15, 20e-12
+    kit = CalibrationKit(
+        open=OpenStandard(c0=c0),
+        short=ShortStandard(l0=l0),
+        load=LoadStandard(resistance=52),
+    )
+    s = kit.evaluate(f)
+    omega = 2 * np.pi * f
+    np.testing.assert_allclose(s["s11_open"], (1 - 1j * omega * c0 * 50) / (1 + 1j * omega * c0 * 50))
+    np.testing.assert_allclose(s["s11_short"], (1j * omega * l0 - 50) / (1j * omega * l0 + 50))
+    np.testing.assert_allclose(s["s11_load"], 2 / 102)
+
+
+def test_offset_delay_rotates_and_loss_attenuates():
+    f = np.linspace(1e9, 10e9, 10)
+    delay = 30e-12
+    lossless = CalibrationKit(open=OpenStandard(offset=Offset(delay=delay))).evaluate(f)
+    np.testing.assert_allclose(lossless["s11_open"], np.exp(-4j * np.pi * f * delay))
+
+    lossy = CalibrationKit(open=OpenStandard(offset=Offset(delay=delay, loss=2e9))).evaluate(f)
+    assert np.all(np.abs(lossy["s11_open"]) < 1)
+    assert np.all(np.diff(np.abs(lossy["s11_open"])) < 0)
+
+
+def test_kit_evaluation_is_cached_and_feeds_the_solver():
+    f = np.linspace(1e9, 10e9, 50)
+    kit = CalibrationKit(
+        open=OpenStandard(c0=40e-15, c1=1e-27, offset=Offset(delay=20e-12)),
+        short=ShortStandard(l0=10e-12, offset=Offset(delay=25e-12)),
+        load=LoadStandard(resistance=49, inductance=5e-12),
+    )
+    s = kit.evaluate(f)
+    assert kit.evaluate(f.copy()) is s
+    assert not s["s11_open"].flags.writeable
+
+    D, S, R = 0.02 + 0.01j, 0.05 - 0.02j, 0.9 + 0.05j
+    cal = OnePortCalibration(
+        sm11_open=_measured_one_port(D, S, R, s["s11_open"]),
+        sm11_short=_measured_one_port(D, S, R, s["s11_short"]),
+        sm11_load=_measured_one_port(D, S, R, s["s11_load"]),
+        **s,
+    )
+    cal.calculate_calibration()
+    np.testing.assert_allclose(cal.cals["D"], D, rtol=1e-9)
+    np.testing.assert_allclose(cal.cals["S"], S, rtol=1e-9)
+    np.testing.assert_allclose(cal.cals["R"], R, rtol=1e-9)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from conftest import random_calibration, write_json_dir
+from port_calibration import load_two_port_cals
+from port_calibration.library import CalibrationLibrary
+
+
+def test_nearest_lookup_and_lru(tmp_path):
+    library = CalibrationLibrary(str(tmp_path / "lib"), max_loaded=2, scales={"bias_mv": 0.1})
+    cals = {}
+    for i, (lo, bias) in enumerate([(220, 2.0), (230, 2.0), (230, 2.5), (240, 2.0)]):
+        cals[f"c{i}"], _ = random_calibration(np.random.default_rng(i), 8)
+        library.add({"lo_ghz": lo, "bias_mv": bias}, cals[f"c{i}"], entry_id=f"c{i}")
+
+    # reopened libraries only read the index
+    library = CalibrationLibrary(str(tmp_path / "lib"), max_loaded=2, scales={"bias_mv": 0.1})
+    assert len(library) == 4 and library.loaded() == []
+
+    entry, cal = library.nearest({"lo_ghz": 231, "bias_mv": 2.1})
+    assert entry["id"] == "c1"
+    np.testing.assert_allclose(cal.e10e01, cals["c1"].e10e01)
+    # bias is in units of 0.1 mV: c2 is 6 GHz away, c3 4 GHz and 0.5 mV
+    assert library.nearest({"lo_ghz": 236, "bias_mv": 2.5})[0]["id"] == "c2"
+    assert library.nearest({"lo_ghz": 219})[0]["id"] == "c0"
+    assert library.loaded() == ["c2", "c0"]
+    assert library.nearest({"lo_ghz": 219})[1] is library.calibration("c0")
+
+    with pytest.raises(KeyError):
+        library.nearest({"lo_ghz": 300}, max_distance=5)
+    with pytest.raises(KeyError):
+        library.nearest({"temperature_k": 4})
+
+    library.remove("c0")
+    assert library.nearest({"lo_ghz": 219})[0]["id"] == "c1"
+    assert not (tmp_path / "lib" / "c0.npy").exists()
+
+
+def test_standards_entries_are_solved_lazily(tmp_path):
+    rng = np.random.default_rng(5)
+    for standard in ("open", "short"):
+        write_json_dir(tmp_path / standard, ("s11", "s22"), rng, 10)
+    for standard in ("load", "through"):
+        write_json_dir(tmp_path / standard, ("s11", "s22", "s12", "s21"), rng, 10)
+    dirs = [str(tmp_path / d) for d in ("open", "short", "load", "through")]
+
+    library = CalibrationLibrary(str(tmp_path / "lib"))
+    library.add_standards({"temperature_k": 4.2}, *dirs, s11_load=0.02, entry_id="cold")
+    assert library.loaded() == []
+    entry, cal = library.nearest({"temperature_k": 4.0})
+    assert entry["id"] == "cold" and library.loaded() == ["cold"]
+    expected, _ = load_two_port_cals(*dirs, s11_load=0.02)
+    for key, value in expected.cals().items():
+        np.testing.assert_allclose(cal.cals()[key], value, rtol=1e-12)
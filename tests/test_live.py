@@ -0,0 +1,94 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from conftest import THRU_KEYS, random_calibration
+from port_calibration.live import CorrectionService, FakeVNA
+
+
+def _calibration(rng, points):
+    cal, standards = random_calibration(rng, points)
+    return cal, [standards[key] for key in THRU_KEYS]
+
+
+async def _collect(queue):
+    items = []
+    while True:
+        item = await queue.get()
+        if item is None:
+            return items
+        items.append(item)
+
+
+def test_service_corrects_every_sweep_and_records_latency():
+    cal, thru = _calibration(np.random.default_rng(14), 32)
+    expected = cal.correct(*thru)
+
+    async def main():
+        service = CorrectionService(cal, maxsize=2, policy="block")
+        queue = service.subscribe()
+        collector = asyncio.create_task(_collect(queue))
+        await service.run(FakeVNA(*thru, count=20))
+        return service, await collector
+
+    service, items = asyncio.run(main())
+    assert [item.index for item in items] == list(range(20))
+    for item in items:
+        for a, b in zip((item.s11, item.s22, item.s12, item.s21), expected):
+            np.testing.assert_allclose(a, b, rtol=1e-12)
+        assert item.latency >= 0
+    stats = service.stats()
+    assert stats["processed"] == 20 and stats["dropped"] == 0
+    assert len(service.latencies) == 20
+
+
+def test_drop_oldest_policy_keeps_latest_sweeps_for_slow_consumers():
+    cal, thru = _calibration(np.random.default_rng(15), 8)
+
+    async def main():
+        service = CorrectionService(cal, maxsize=3, policy="drop_oldest")
+        queue = service.subscribe()
+        # nobody reads until the stream has ended
+        await service.run(FakeVNA(*thru, count=10))
+        return service, await _collect(queue)
+
+    service, items = asyncio.run(main())
+    assert service.dropped > 0
+    assert items[-1].index == 9
+    assert len(items) <= 3
+
+
+class _FailingCalibration:
+    def __init__(self, cal, after: int):
+        self.cal = cal
+        self.after = after
+        self.calls = 0
+
+    def correct(self, *sm):
+        self.calls += 1
+        if self.calls > self.after:
+            raise RuntimeError("correction failed")
+        return self.cal.correct(*sm)
+
+
+def test_failed_correction_ends_subscriber_streams_and_stops_the_source():
+    cal, thru = _calibration(np.random.default_rng(16), 8)
+
+    async def main():
+        service = CorrectionService(_FailingCalibration(cal, after=2), maxsize=2)
+        queue = service.subscribe()
+        # a subscriber that never reads, its queue is full when the correction fails
+        idle = service.subscribe()
+        collector = asyncio.create_task(_collect(queue))
+        with pytest.raises(RuntimeError, match="correction failed"):
+            await service.run(FakeVNA(*thru, count=1000))
+        items = await asyncio.wait_for(collector, timeout=5)
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return items, await _collect(idle), pending
+
+    items, idle_items, pending = asyncio.run(main())
+    assert [item.index for item in items] == [0, 1]
+    # the oldest item made room for the end of stream
+    assert [item.index for item in idle_items] == [1]
+    assert pending == []
@@ -0,0 +1,79 @@
+import numpy as np
+
+from conftest import cnoise, random_standards
+from port_calibration import TwoPortCalibration
+from port_calibration.multiport import MultiPortCalibration
+
+
+def _measured_one_port(D, S, R, gamma):
+    return D + (R * gamma) / (1 - S * gamma)
+
+
+def test_two_port_case_matches_two_port_calibration():
+    rng = np.random.default_rng(20)
+    points = 15
+    st = random_standards(rng, points)
+
+    cal = TwoPortCalibration(**st, s11_load=0.01, s11_open=0.99, s11_short=-0.99)
+    cal.calibrate()
+
+    thru = np.stack(
+        [st["throw_sm11"], st["throw_sm12"], st["throw_sm21"], st["throw_sm22"]], axis=-1
+    )
+    multi = MultiPortCalibration(
+        open_sm=np.stack([st["open_sm11"], st["open_sm22"]], axis=-1),
+        short_sm=np.stack([st["short_sm11"], st["short_sm22"]], axis=-1),
+        load_sm=np.stack([st["load_sm11"], st["load_sm22"]], axis=-1),
+        thru_sm={(0, 1): thru.reshape(-1, 2, 2)},
+        s11_load=0.01,
+        s11_open=0.99,
+        s11_short=-0.99,
+    )
+    multi.calibrate()
+
+    sm11, sm22, sm12, sm21 = (cnoise(rng, 0.3, points) for _ in range(4))
+    sm = np.stack([sm11, sm12, sm21, sm22], axis=-1).reshape(-1, 2, 2)
+    s11, s22, s12, s21 = cal.correct(sm11, sm22, sm12, sm21)
+    for corrected in (multi.correct(sm), MultiPortCalibration.from_two_port(cal).correct(sm)):
+        np.testing.assert_allclose(corrected[:, 0, 0], s11, rtol=1e-10)
+        np.testing.assert_allclose(corrected[:, 1, 1], s22, rtol=1e-10)
+        np.testing.assert_allclose(corrected[:, 0, 1], s12, rtol=1e-10)
+        np.testing.assert_allclose(corrected[:, 1, 0], s21, rtol=1e-10)
+
+
+def test_four_port_recovers_dut_from_synthetic_measurements():
+    rng = np.random.default_rng(21)
+    points, P = 10, 4
+    ED = cnoise(rng, 0.02, (points, P))
+    ES = cnoise(rng, 0.05, (points, P))
+    ER = 0.95 + cnoise(rng, 0.03, (points, P))
+    EL = cnoise(rng, 0.05, (points, P, P))
+    ET = 0.9 + cnoise(rng, 0.03, (points, P, P))
+
+    thru_sm = {}
+    for i in range(P):
+        for j in range(i + 1, P):
+            sm = np.empty((points, 2, 2), dtype=complex)
+            for drive, receive, (r, t) in ((i, j, (0, 1)), (j, i, (1, 0))):
+                load_match = EL[:, receive, drive]
+                sm[:, r, r] = _measured_one_port(
+                    ED[:, drive], ES[:, drive], ER[:, drive], load_match
+                )
+                sm[:, t, r] = ET[:, receive, drive] / (1 - ES[:, drive] * load_match)
+            thru_sm[(i, j)] = sm
+
+    cal = MultiPortCalibration(
+        open_sm=_measured_one_port(ED, ES, ER, 1),
+        short_sm=_measured_one_port(ED, ES, ER, -1),
+        load_sm=_measured_one_port(ED, ES, ER, 0),
+        thru_sm=thru_sm,
+    )
+    cal.calibrate()
+
+    off_diag = ~np.eye(P, dtype=bool)
+    np.testing.assert_allclose(cal.match[:, off_diag], EL[:, off_diag], rtol=1e-9)
+    np.testing.assert_allclose(cal.tracking[:, off_diag], ET[:, off_diag], rtol=1e-9)
+
+    dut = cnoise(rng, 0.3, (points, P, P))
+    measured = cal.predict(dut)
+    np.testing.assert_allclose(cal.correct(measured), dut, rtol=1e-9, atol=1e-12)
@@ -54,6 +54,27 @@ def test_one_port_calibrate_measure_returns_true_gamma():
     np.testing.assert_allclose(gamma_cal, gamma_true, rtol=1e-9, atol=1e-12)
 
 
+def test_one_port_complex64_error_terms():
+    D = np.array([0.01 + 0.02j, -0.015 + 0.01j, 0.02 - 0.005j])
+    S = np.array([0.08 - 0.01j, 0.05 + 0.015j, -0.03 + 0.02j])
+    R = np.array([0.95 + 0.03j, 1.02 - 0.02j, 0.85 + 0.08j])
+
+    cal = OnePortCalibration(
+        sm11_open=_measured_one_port(D, S, R, 1),
+        sm11_short=_measured_one_port(D, S, R, -1),
+        sm11_load=_measured_one_port(D, S, R, 0),
+        dtype=np.complex64,
+    )
+    cal.calculate_calibration()
+    assert all(term.dtype == np.complex64 for term in cal.cals.values())
+
+    gamma_true = np.array([0.2 + 0.1j, -0.3 + 0.05j, 0.1 - 0.2j])
+    sm11_measured = _measured_one_port(D, S, R, gamma_true).astype(np.complex64)
+    gamma_cal = cal.calibrate_measure(sm11_measured)
+    assert gamma_cal.dtype == np.complex64
+    np.testing.assert_allclose(gamma_cal, gamma_true, atol=1e-6)
+
+
 def test_one_port_with_noisy_standards_recovers_reasonable_gamma():
     rng = np.random.default_rng(0)
     points = 8
@@ -89,3 +110,55 @@ def test_one_port_with_noisy_standards_recovers_reasonable_gamma():
     gamma_cal = cal.calibrate_measure(sm11_measured)
 
     np.testing.assert_allclose(gamma_cal, gamma_true, rtol=2e-2, atol=2e-2)
+
+
+def _lstsq_reference(cal):
+    D, S, R = [], [], []
+    for i in range(len(cal.sm11_load)):
+        C = np.array(
+            [
+                [cal.s11_load, 1, cal.s11_load * cal.sm11_load[i]],
+                [cal.s11_open, 1, cal.s11_open * cal.sm11_open[i]],
+                [cal.s11_short, 1, cal.s11_short * cal.sm11_short[i]],
+            ]
+        )
+        V = np.array([cal.sm11_load[i], cal.sm11_open[i], cal.sm11_short[i]])
+        x = np.linalg.lstsq(C, V, rcond=None)[0]
+        D.append(x[1])
+        S.append(x[2])
+        R.append(x[0] + x[1] * x[2])
+    return np.array(D), np.array(S), np.array(R)
+
+
+def test_one_port_batched_solver_matches_lstsq_and_falls_back_on_singular_points():
+    rng = np.random.default_rng(2)
+    points = 50
+    D = 0.02 + 0.01j + rng.normal(scale=0.01, size=points)
+    S = 0.06 - 0.02j + rng.normal(scale=0.01, size=points)
+    R = 0.95 + 0.03j + rng.normal(scale=0.01, size=points)
+
+    sm11_open = _measured_one_port(D, S, R, 0.99)
+    sm11_short = _measured_one_port(D, S, R, -0.99)
+    sm11_load = _measured_one_port(D, S, R, 0.01)
+    # Degenerate point: all three standards read the same value
+    sm11_short[7] = sm11_open[7]
+    sm11_load[7] = sm11_open[7]
+
+    cal = OnePortCalibration(
+        sm11_open=sm11_open,
+        sm11_short=sm11_short,
+        sm11_load=sm11_load,
+        s11_open=0.99,
+        s11_short=-0.99,
+        s11_load=0.01,
+    )
+    cal.calculate_calibration()
+
+    assert cal.cond.shape == (points,)
+    assert cal.cond[7] > cal.cond_threshold
+    assert np.all(np.delete(cal.cond, 7) < cal.cond_threshold)
+
+    D_ref, S_ref, R_ref = _lstsq_reference(cal)
+    np.testing.assert_allclose(cal.cals["D"], D_ref, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(cal.cals["S"], S_ref, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(cal.cals["R"], R_ref, rtol=1e-9, atol=1e-12)
@@ -0,0 +1,79 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from conftest import random_calibration
+from port_calibration import shared as shared_module
+from port_calibration.shared import SharedCalibration, SharedCalibrationStore
+
+
+def _calibration(seed, points=20):
+    kit = {"s11_load": 0.01, "s11_open": 0.99, "s11_short": -0.99}
+    return random_calibration(np.random.default_rng(seed), points, **kit)[0]
+
+
+def _correct_in_worker(directory, sm):
+    shared = SharedCalibration("test", directory)
+    return shared.version, shared.correct(*sm)
+
+
+def test_publish_attach_and_refresh(tmp_path, monkeypatch):
+    store = SharedCalibrationStore("test", str(tmp_path), keep=1)
+    cal = _calibration(1)
+    assert store.publish(cal) == 1
+
+    mapped = []
+    load_rows = shared_module._load_rows
+
+    def recording_load_rows(*args, **kwargs):
+        mapped.append(load_rows(*args, **kwargs))
+        return mapped[-1]
+
+    monkeypatch.setattr(shared_module, "_load_rows", recording_load_rows)
+    shared = SharedCalibration("test", str(tmp_path))
+    sm = tuple(np.random.default_rng(2).normal(size=(4, 20)) + 0j for _ in range(4))
+    for got, expected in zip(shared.correct(*sm), cal.correct(*sm)):
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+    # terms and coefficients are read from the mapped file, not copies of it
+    rows = mapped[-1]
+    assert isinstance(shared.calibration.e00, np.memmap)
+    assert np.shares_memory(shared.calibration.e00, rows["E00"])
+    assert np.shares_memory(shared.calibration._coeffs["e00"], rows["E00"])
+    assert np.shares_memory(shared.calibration._coeffs["inv_e10e01"], rows["inv_e10e01"])
+    with pytest.raises(ValueError):
+        shared.calibration.e00[0] = 0
+
+    with ProcessPoolExecutor(2) as pool:
+        version, corrected = pool.submit(_correct_in_worker, str(tmp_path), sm).result()
+    assert version == 1
+    np.testing.assert_allclose(corrected[0], cal.correct(*sm)[0], rtol=1e-12)
+
+    new = _calibration(3)
+    assert store.publish(new) == 2
+    assert store.versions() == [2]
+    # the old mapping stays usable until the worker refreshes
+    shared.correct(*sm)
+    assert shared.refresh() and shared.version == 2
+    assert not shared.refresh()
+    np.testing.assert_allclose(shared.correct(*sm)[2], new.correct(*sm)[2], rtol=1e-12)
+
+    store.close()
+    assert not (tmp_path / "port-cal-test").exists()
+
+
+def test_attach_gives_up_on_a_missing_version_file(tmp_path, monkeypatch):
+    store = SharedCalibrationStore("test", str(tmp_path))
+    store.publish(_calibration(1))
+    (tmp_path / "port-cal-test" / "v1.npy").unlink()
+
+    sleeps = []
+    monkeypatch.setattr(shared_module.time, "sleep", sleeps.append)
+    with pytest.raises(FileNotFoundError):
+        SharedCalibration("test", str(tmp_path))
+    assert len(sleeps) == shared_module.ATTACH_RETRIES - 1
+    assert sleeps[1] == 2 * sleeps[0]
+
+    store.close()
+    assert store.version() == 0
+    assert not (tmp_path / "port-cal-test").exists()
@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+
+from port_calibration import (
+    convert_json_dirs,
+    load_cals,
+    load_standards,
+    load_two_port_cals,
+    load_two_port_cals_npy,
+    save_cals,
+    TwoPortCalibration,
+)
+
+
+def _write_standards(root, rng, points=16):
+    dirs = {}
+    for standard, params in (
+        ("open", ("s11", "s22")),
+        ("short", ("s11", "s22")),
+        ("load", ("s11", "s22", "s12", "s21")),
+        ("through", ("s11", "s22", "s12", "s21")),
+    ):
+        d = root / standard
+        d.mkdir()
+        for param in params:
+            data = {
+                "real": rng.normal(scale=0.5, size=points).tolist(),
+                "imag": rng.normal(scale=0.5, size=points).tolist(),
+            }
+            (d / f"{param}.json").write_text(json.dumps({"data": data}))
+        dirs[standard] = str(d)
+    return dirs
+
+
+def test_binary_standards_and_cals_round_trip(tmp_path):
+    dirs = _write_standards(tmp_path, np.random.default_rng(4))
+    cal, standards = load_two_port_cals(
+        dirs["open"], dirs["short"], dirs["load"], dirs["through"]
+    )
+
+    standards_path = str(tmp_path / "standards.npy")
+    convert_json_dirs(
+        dirs["open"], dirs["short"], dirs["load"], dirs["through"], standards_path
+    )
+    loaded = load_standards(standards_path)
+    assert isinstance(loaded["open_sm11"], np.memmap)
+    for key, value in standards.items():
+        np.testing.assert_array_equal(loaded[key], value)
+
+    cals_path = str(tmp_path / "cals.npy")
+    save_cals(cals_path, cal)
+    for key, value in load_cals(cals_path).items():
+        np.testing.assert_array_equal(value, cal.cals()[key])
+
+    solved, _ = load_two_port_cals_npy(standards_path)
+    stored, _ = load_two_port_cals_npy(standards_path, cals_path)
+    sm = [standards[k] for k in ("throw_sm11", "throw_sm22", "throw_sm12", "throw_sm21")]
+    for a, b, c in zip(cal.correct(*sm), solved.correct(*sm), stored.correct(*sm)):
+        np.testing.assert_allclose(b, a, rtol=1e-12)
+        np.testing.assert_array_equal(c, a)
+
+    single, _ = load_two_port_cals(
+        dirs["open"], dirs["short"], dirs["load"], dirs["through"], dtype=np.complex64
+    )
+    single_path = str(tmp_path / "cals64.npy")
+    save_cals(single_path, single)
+    assert load_cals(single_path)["E00"].dtype == np.complex64
+    assert TwoPortCalibration.from_cals(load_cals(single_path)).dtype == np.complex64
@@ -0,0 +1,51 @@
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from conftest import cnoise, random_calibration
+from port_calibration import OnePortCalibration
+from port_calibration.streaming import (
+    array_sink,
+    correct_one_port_stream,
+    correct_two_port_stream,
+    iter_chunks,
+)
+
+
+def test_two_port_stream_matches_in_memory_correction(tmp_path):
+    rng = np.random.default_rng(8)
+    points, sweeps = 50, 3
+    cal, _ = random_calibration(rng, points)
+
+    inputs = []
+    for name in ("sm11", "sm22", "sm12", "sm21"):
+        data = open_memmap(
+            str(tmp_path / f"{name}.npy"), mode="w+", dtype=complex, shape=(sweeps, points)
+        )
+        data[:] = cnoise(rng, 0.3, (sweeps, points))
+        inputs.append(data)
+    outputs = [
+        open_memmap(str(tmp_path / f"{name}.npy"), mode="w+", dtype=complex, shape=(sweeps, points))
+        for name in ("s11", "s22", "s12", "s21")
+    ]
+
+    correct_two_port_stream(cal, iter_chunks(inputs, 7), array_sink(*outputs))
+
+    for out, expected in zip(outputs, cal.correct(*inputs)):
+        np.testing.assert_allclose(out, expected, rtol=1e-12, atol=1e-14)
+
+
+def test_one_port_stream_matches_calibrate_measure():
+    rng = np.random.default_rng(9)
+    points = 40
+    cal = OnePortCalibration(
+        0.9 + cnoise(rng, 0.05, points),
+        -0.9 + cnoise(rng, 0.05, points),
+        cnoise(rng, 0.05, points),
+    )
+    cal.calculate_calibration()
+    sm11 = cnoise(rng, 0.3, points)
+    out = np.empty(points, dtype=complex)
+
+    correct_one_port_stream(cal, iter_chunks([sm11], 16), array_sink(out))
+
+    np.testing.assert_allclose(out, cal.calibrate_measure(sm11), rtol=1e-12, atol=1e-14)
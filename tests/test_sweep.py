@@ -0,0 +1,79 @@
+import numpy as np
+
+from conftest import cnoise, write_json_dir
+from port_calibration import (
+    Sweep,
+    TwoPortCalibration,
+    load_two_port_standards,
+    load_two_port_sweeps,
+    read_sweep,
+    write_sweep,
+)
+
+
+def test_parameters_are_views_into_one_array():
+    rng = np.random.default_rng(22)
+    s11, s22, s12, s21 = (cnoise(rng, 1, 10) for _ in range(4))
+    sweep = Sweep.from_params(s11, s22, s12, s21, frequency=np.arange(10.0))
+    assert sweep.data.shape == (10, 2, 2) and sweep.data.flags.c_contiguous
+    for view, expected in zip(sweep.params(), (s11, s22, s12, s21)):
+        assert np.shares_memory(view, sweep.data)
+        np.testing.assert_array_equal(view, expected)
+    assert np.shares_memory(sweep.sm21, sweep.data)
+    np.testing.assert_array_equal(sweep.data[:, 1, 0], s21)
+
+    part = sweep[2:5]
+    assert len(part) == 3 and np.shares_memory(part.data, sweep.data)
+    np.testing.assert_array_equal(part.frequency, [2, 3, 4])
+
+
+def test_strided_layouts_are_normalised():
+    rng = np.random.default_rng(24)
+    data = cnoise(rng, 1, (10, 2, 2))
+    transposed = Sweep(data.transpose(0, 2, 1))
+    assert transposed.data.flags.c_contiguous
+    np.testing.assert_array_equal(transposed.s12, data[:, 1, 0])
+
+    # frequency slices of a batch keep their packed blocks and stay views
+    batch = Sweep(cnoise(rng, 1, (3, 10, 2, 2)))
+    part = batch[2:5]
+    assert np.shares_memory(part.data, batch.data) and not part.data.flags.c_contiguous
+    empty = Sweep.empty_like(part)
+    assert empty.data.shape == (3, 3, 2, 2) and empty.data.flags.c_contiguous
+
+
+def test_calibration_from_sweeps_and_correct_sweep(tmp_path):
+    rng = np.random.default_rng(23)
+    points = 16
+    for standard in ("open", "short"):
+        write_json_dir(tmp_path / standard, ("s11", "s22"), rng, points)
+    for standard in ("load", "through"):
+        write_json_dir(tmp_path / standard, ("s11", "s22", "s12", "s21"), rng, points)
+    dirs = [str(tmp_path / d) for d in ("open", "short", "load", "through")]
+
+    sweeps = load_two_port_sweeps(*dirs)
+    threaded = load_two_port_sweeps(*dirs, workers=4)
+    for name, sweep in sweeps.items():
+        np.testing.assert_array_equal(sweep.data, threaded[name].data)
+    cal = TwoPortCalibration.from_sweeps(**sweeps, s11_load=0.01)
+    assert np.shares_memory(cal.throw_sm12, sweeps["through"].data)
+    cal.calibrate()
+
+    reference = TwoPortCalibration(**load_two_port_standards(*dirs), s11_load=0.01)
+    reference.calibrate()
+    for key, value in reference.cals().items():
+        np.testing.assert_allclose(cal.cals()[key], value, rtol=1e-12)
+
+    frequency = np.linspace(1e9, 2e9, points)
+    dut = Sweep(cnoise(rng, 0.5, (points, 2, 2)), frequency)
+    path = str(tmp_path / "dut.s2p")
+    write_sweep(path, dut)
+    loaded = read_sweep(path)
+    np.testing.assert_allclose(loaded.data, dut.data, rtol=1e-10)
+    assert loaded.data.flags.c_contiguous
+    np.testing.assert_allclose(loaded.frequency, frequency)
+
+    out = Sweep.empty_like(loaded)
+    assert cal.correct_sweep(loaded, out=out) is out
+    for got, expected in zip(out.params(), reference.correct(*loaded.params())):
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
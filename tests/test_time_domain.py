@@ -0,0 +1,53 @@
+import numpy as np
+
+import port_calibration
+from port_calibration.time_domain import (
+    cached_time_domain,
+    impulse_response,
+    step_response,
+    time_gate,
+)
+
+
+def _two_reflections(frequency, sweeps=1):
+    s = 0.5 * np.exp(-2j * np.pi * frequency * 1e-9)
+    s += 0.2 * np.exp(-2j * np.pi * frequency * 3e-9)
+    return np.tile(s, (sweeps, 1))
+
+
+def test_impulse_and_step_locate_reflections():
+    frequency = np.arange(1, 401) * 25e6
+    s = _two_reflections(frequency, sweeps=50)
+
+    time, h = impulse_response(frequency, s)
+    assert h.shape == (50, len(time)) and np.isrealobj(h)
+    peak = np.argmax(h, axis=-1)
+    np.testing.assert_allclose(time[peak], 1e-9, atol=time[1] - time[0])
+    np.testing.assert_allclose(h[:, peak[0]], 0.5, rtol=0.01)
+
+    time_bp, h_bp = impulse_response(frequency, s, mode="bandpass")
+    np.testing.assert_allclose(np.abs(h_bp).max(axis=-1), 0.5, rtol=0.03)
+
+    time, step = step_response(frequency, s[0])
+    assert abs(step[np.searchsorted(time, 2e-9)] - 0.5) < 0.05
+    assert abs(step[-1] - 0.7) < 0.1
+
+
+def test_setup_cached_per_grid():
+    frequency = np.arange(1, 101) * 1e7
+    assert cached_time_domain(frequency) is cached_time_domain(frequency.copy())
+    assert cached_time_domain(frequency) is not cached_time_domain(frequency, mode="bandpass")
+    # the submodule stays reachable from the package
+    assert port_calibration.time_domain.TimeDomain is type(cached_time_domain(frequency))
+    assert port_calibration.cached_time_domain is cached_time_domain
+
+
+def test_gate_keeps_selected_reflection():
+    frequency = 2e9 + np.arange(400) * 25e6
+    s = _two_reflections(frequency, sweeps=20)
+    expected = 0.5 * np.exp(-2j * np.pi * frequency * 1e-9)
+
+    gated = time_gate(frequency, s, start=0.5e-9, stop=2e-9)
+    assert gated.shape == s.shape
+    # gating smears the band edges, the middle is recovered
+    np.testing.assert_allclose(gated[:, 50:-50], np.tile(expected, (20, 1))[:, 50:-50], atol=0.01)
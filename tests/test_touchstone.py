@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from port_calibration.touchstone import (
+    load_two_port_cals_touchstone,
+    read_one_port,
+    read_touchstone,
+    write_touchstone,
+    write_two_port,
+)
+
+
+def _random_s(rng, points, ports):
+    shape = (points, ports, ports)
+    return rng.uniform(0.1, 0.9, shape) * np.exp(1j * rng.uniform(-3, 3, shape))
+
+
+@pytest.mark.parametrize("fmt", ["RI", "MA", "DB"])
+@pytest.mark.parametrize("ports", [1, 2, 3])
+def test_touchstone_round_trip(tmp_path, fmt, ports):
+    rng = np.random.default_rng(10)
+    frequency = np.linspace(1e9, 2e9, 11)
+    s = _random_s(rng, len(frequency), ports)
+    path = str(tmp_path / f"dut.s{ports}p")
+
+    write_touchstone(path, frequency, s, fmt=fmt, unit="MHz", comment="test")
+    f, s_read, z0 = read_touchstone(path)
+
+    np.testing.assert_allclose(f, frequency, rtol=1e-12)
+    np.testing.assert_allclose(s_read, s, rtol=1e-9)
+    assert z0 == 50
+
+
+def test_touchstone_reader_handles_comments_order_and_units(tmp_path):
+    path = tmp_path / "thru.s2p"
+    path.write_text(
+        "! measured thru\n"
+        "# khz s db r 75\n"
+        "1 0 0  -6.0206 90  0 -90  -20 180 ! first point\n"
+        "\n"
+        "2 -40 0  0 0  0 0  -40 0\n"
+    )
+    f, s, z0 = read_touchstone(str(path))
+
+    np.testing.assert_allclose(f, [1e3, 2e3])
+    assert z0 == 75
+    # S21 is the second pair in 2-port files
+    np.testing.assert_allclose(s[0, 1, 0], 0.5j, atol=1e-6)
+    np.testing.assert_allclose(s[0, 0, 1], -1j, atol=1e-9)
+    np.testing.assert_allclose(s[0, 1, 1], -0.1, atol=1e-9)
+    np.testing.assert_allclose(s[1, 0, 0], 0.01, atol=1e-9)
+
+    one_port = tmp_path / "load.s1p"
+    one_port.write_text("# HZ S RI R 50\n1 0.1 0.2\n2 0.3 -0.4\n")
+    f, sm11 = read_one_port(str(one_port))
+    np.testing.assert_allclose(sm11, [0.1 + 0.2j, 0.3 - 0.4j])
+
+    bad = tmp_path / "bad.s1p"
+    bad.write_text("# HZ S RI R 50\n1 0.1 0.2\n2 0.3\n")
+    with pytest.raises(ValueError):
+        read_touchstone(str(bad))
+
+
+def test_two_port_cals_from_touchstone_standards(tmp_path):
+    rng = np.random.default_rng(11)
+    frequency = np.linspace(1e9, 2e9, 8)
+    paths = {}
+    for name, gamma in (("open", 0.9), ("short", -0.9), ("load", 0.0), ("through", None)):
+        s = 0.05 * _random_s(rng, len(frequency), 2)
+        if gamma is None:
+            s[:, 0, 1] += 0.9
+            s[:, 1, 0] += 0.9
+        else:
+            s[:, 0, 0] += gamma
+            s[:, 1, 1] += gamma
+        paths[name] = str(tmp_path / f"{name}.s2p")
+        write_touchstone(paths[name], frequency, s)
+
+    cal, standards, f = load_two_port_cals_touchstone(
+        paths["open"], paths["short"], paths["load"], paths["through"]
+    )
+    np.testing.assert_allclose(f, frequency)
+    sm = [standards[k] for k in ("throw_sm11", "throw_sm22", "throw_sm12", "throw_sm21")]
+    s11, s22, s12, s21 = cal.correct(*sm)
+
+    out = str(tmp_path / "corrected.s2p")
+    write_two_port(out, f, s11, s22, s12, s21)
+    _, s = read_touchstone(out)[:2]
+    np.testing.assert_allclose(s[:, 1, 0], s21, rtol=1e-9)
+    np.testing.assert_allclose(s[:, 0, 1], s12, rtol=1e-9)
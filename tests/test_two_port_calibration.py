@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
+from conftest import cnoise, random_standards
 from port_calibration import TwoPortCalibration
 
 
@@ -193,3 +196,128 @@ def test_two_port_with_noisy_standards_produces_reasonable_thru():
     np.testing.assert_allclose(s22, np.zeros_like(s22), rtol=5e-2, atol=5e-2)
     np.testing.assert_allclose(s21, np.ones_like(s21), rtol=5e-2, atol=5e-2)
     np.testing.assert_allclose(s12, np.ones_like(s12), rtol=5e-2, atol=5e-2)
+
+
+def test_two_port_fused_correct_matches_calc_s():
+    rng = np.random.default_rng(3)
+    points = 20
+
+    standards = list(random_standards(rng, points).values())
+    cal = TwoPortCalibration(*standards)
+    cal.calibrate()
+
+    sm11, sm22, sm12, sm21 = (cnoise(rng, 0.3, points) for _ in range(4))
+    expected = (
+        cal.calc_S11(sm11, sm22, sm12, sm21),
+        cal.calc_S22(sm11, sm22, sm12, sm21),
+        cal.calc_S12(sm11, sm22, sm12, sm21),
+        cal.calc_S21(sm11, sm22, sm12, sm21),
+    )
+
+    result = cal.correct(sm11, sm22, sm12, sm21)
+    for r, e in zip(result, expected):
+        np.testing.assert_allclose(r, e, rtol=1e-12, atol=1e-14)
+
+    out = tuple(np.empty(points, dtype=complex) for _ in range(4))
+    workspace = cal.workspace(points)
+    for _ in range(2):
+        result = cal.correct(sm11, sm22, sm12, sm21, out=out, workspace=workspace)
+        for r, o, e in zip(result, out, expected):
+            assert r is o
+            np.testing.assert_allclose(o, e, rtol=1e-12, atol=1e-14)
+
+
+def test_two_port_correct_is_safe_across_threads():
+    rng = np.random.default_rng(4)
+    points = 20000
+
+    standards = list(random_standards(rng, points).values())
+    cal = TwoPortCalibration(*standards)
+    cal.calibrate()
+
+    sweeps = [tuple(cnoise(rng, 0.3, points) for _ in range(4)) for _ in range(16)]
+    expected = [cal.correct(*sm) for sm in sweeps]
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda sm: cal.correct(*sm), sweeps * 4))
+    for result, reference in zip(results, expected * 4):
+        for r, e in zip(result, reference):
+            np.testing.assert_array_equal(r, e)
+
+
+def test_two_port_recalibrate_reruns_only_stale_steps():
+    rng = np.random.default_rng(13)
+    points = 10
+
+    standards = list(random_standards(rng, points).values())
+    cal = TwoPortCalibration(*standards)
+    assert cal.stale
+    cal.recalibrate()
+    assert not cal.stale
+
+    solves = []
+    one_port = cal._one_port
+    cal._one_port = lambda *args: solves.append(args) or one_port(*args)
+
+    new_thru_sm21 = 0.9 + cnoise(rng, 0.05, points)
+    cal.update(throw_sm21=new_thru_sm21)
+    assert cal.stale == {"step_3_p1"}
+    cal.recalibrate()
+    assert solves == []
+
+    new_open_sm22 = 0.9 + cnoise(rng, 0.05, points)
+    cal.update(open_sm22=new_open_sm22)
+    assert cal.stale == {"step_1_p2", "step_3_p2"}
+    cal.recalibrate()
+    assert len(solves) == 1
+
+    standards[11] = new_thru_sm21
+    standards[5] = new_open_sm22
+    full = TwoPortCalibration(*standards)
+    full.calibrate()
+    for key, value in full.cals().items():
+        np.testing.assert_allclose(cal.cals()[key], value, rtol=1e-12)
+    sm = standards[8:]
+    for a, b in zip(cal.correct(*sm), full.correct(*sm)):
+        np.testing.assert_allclose(a, b, rtol=1e-12)
+
+
+def test_two_port_complex64_terms_within_documented_bound():
+    rng = np.random.default_rng(24)
+    points = 5000
+
+    standards = list(random_standards(rng, points).values())
+    full = TwoPortCalibration(*standards)
+    full.calibrate()
+    single = TwoPortCalibration(*standards, dtype=np.complex64)
+    single.calibrate()
+    assert all(c.dtype == np.complex64 for c in single._coeffs.values())
+    # the terms are stored once, in single precision, and shared with the coefficients
+    assert single._coeffs["e00"] is single.e00
+    for key, value in full.cals().items():
+        assert single.cals()[key].dtype == np.complex64
+        np.testing.assert_allclose(single.cals()[key], value, rtol=1e-6)
+    stored = sum(single.cals()[key].nbytes for key in full.cals())
+    stored += sum(c.nbytes for c in single._coeffs.values())
+    full_stored = sum(value.nbytes for value in full.cals().values())
+    full_stored += sum(c.nbytes for c in full._coeffs.values())
+    assert 2 * stored == full_stored
+
+    # re-solving step 3 re-derives the double precision step 1 terms it reads
+    thru = full.throw_sm21 * (1 + 1e-3)
+    full.update(throw_sm21=thru)
+    full.recalibrate()
+    single.update(throw_sm21=thru)
+    single.recalibrate()
+    np.testing.assert_array_equal(single.e10e32, full.e10e32.astype(np.complex64))
+
+    s = [cnoise(rng, 0.5, points) for _ in range(4)]
+    sm = full.predict(*s)
+    expected = full.correct(*sm)
+    corrected = single.correct(*(m.astype(np.complex64) for m in sm))
+    bound = 16 * 2.0 ** -24 / np.abs(full.calc_D(*sm))
+    for got, ref in zip(corrected, expected):
+        assert got.dtype == np.complex64
+        assert np.all(np.abs(got - ref) <= bound * (1 + np.abs(ref)))
+        assert np.abs(got - ref).max() < 3.2e-6
+    # the coefficients set the output precision, also for complex128 measurements
+    assert all(got.dtype == np.complex64 for got in single.correct(*sm))
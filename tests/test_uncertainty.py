@@ -0,0 +1,41 @@
+import numpy as np
+
+from conftest import NOMINAL, random_standards
+from port_calibration import TwoPortCalibration
+from port_calibration.uncertainty import MonteCarlo, Normal, Uniform
+
+
+def test_without_noise_matches_single_solve():
+    standards = random_standards(np.random.default_rng(25), 20)
+    cal = TwoPortCalibration(**standards, s11_load=0.01, s11_open=0.99, s11_short=-0.99)
+    cal.calibrate()
+    dut = cal.predict(0.1, 0.2, 0.7, 0.7)
+
+    result = MonteCarlo(standards).run(samples=10, dut=dut, chunk_size=3)
+    assert result.samples == 10
+    for key, value in cal.cals().items():
+        np.testing.assert_allclose(result.terms[key].mean, value, rtol=1e-12)
+        np.testing.assert_allclose(result.terms[key].std, 0, atol=1e-12)
+    np.testing.assert_allclose(result.corrected["s21"].mean, 0.7, rtol=1e-10)
+
+
+def test_confidence_radius_covers_fresh_samples():
+    rng = np.random.default_rng(26)
+    points = 50
+    standards = random_standards(rng, points)
+    noise = {key: Normal(2e-3) for key in NOMINAL}
+    kit = {"s11_open": Uniform(0.01, correlated=True)}
+    cal = TwoPortCalibration(**standards, s11_load=0.01, s11_open=0.99, s11_short=-0.99)
+    cal.calibrate()
+    dut = cal.predict(0.1, 0.2, 0.7, 0.7)
+
+    mc = MonteCarlo(standards, standard_noise=noise, kit_noise=kit, seed=1)
+    result = mc.run(samples=3000, dut=dut, chunk_size=500, confidence=0.9)
+    s21 = result.corrected["s21"]
+    assert np.all(s21.std > 0)
+    lower, upper = s21.magnitude()
+    assert np.all(lower < 0.7) and np.all(upper > 0.7)
+
+    fresh = MonteCarlo(standards, standard_noise=noise, kit_noise=kit, seed=2).calibration(2000)
+    inside = np.abs(fresh.correct(*dut)[3] - s21.mean) <= s21.radius
+    assert abs(inside.mean() - 0.9) < 0.03
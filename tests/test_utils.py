@@ -0,0 +1,111 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from port_calibration import (
+    CalibrationCache,
+    StandardsLoadError,
+    TwoPortCalibration,
+    load_two_port_cals,
+)
+
+
+def _write_standards(root, rng, points=16):
+    dirs = {}
+    for standard, params in (
+        ("open", ("s11", "s22")),
+        ("short", ("s11", "s22")),
+        ("load", ("s11", "s22", "s12", "s21")),
+        ("through", ("s11", "s22", "s12", "s21")),
+    ):
+        d = root / standard
+        d.mkdir()
+        for param in params:
+            data = {
+                "real": rng.normal(scale=0.5, size=points).tolist(),
+                "imag": rng.normal(scale=0.5, size=points).tolist(),
+            }
+            (d / f"{param}.json").write_text(json.dumps({"data": data}))
+        dirs[standard] = str(d)
+    return dirs
+
+
+def test_parallel_loading_matches_sequential(tmp_path):
+    dirs = _write_standards(tmp_path, np.random.default_rng(5))
+    args = (dirs["open"], dirs["short"], dirs["load"], dirs["through"])
+
+    cal, standards = load_two_port_cals(*args)
+    cal_p, standards_p = load_two_port_cals(*args, workers=4)
+
+    assert list(standards_p) == list(standards)
+    for key, value in standards.items():
+        np.testing.assert_array_equal(standards_p[key], value)
+    for key, value in cal.cals().items():
+        np.testing.assert_array_equal(cal_p.cals()[key], value)
+
+
+def test_parallel_loading_reports_every_failed_file(tmp_path):
+    dirs = _write_standards(tmp_path, np.random.default_rng(6))
+    os.remove(f"{dirs['open']}/s22.json")
+    with open(f"{dirs['through']}/s21.json", "w") as f:
+        f.write("not json")
+
+    with pytest.raises(StandardsLoadError) as exc_info:
+        load_two_port_cals(
+            dirs["open"], dirs["short"], dirs["load"], dirs["through"], workers=3
+        )
+    errors = exc_info.value.errors
+    assert set(errors) == {f"{dirs['open']}/s22.json", f"{dirs['through']}/s21.json"}
+    assert isinstance(errors[f"{dirs['open']}/s22.json"], FileNotFoundError)
+    assert "s21.json" in str(exc_info.value)
+
+
+def test_cached_loading_skips_solve_and_invalidates_on_change(tmp_path, monkeypatch):
+    dirs = _write_standards(tmp_path, np.random.default_rng(7))
+    args = (dirs["open"], dirs["short"], dirs["load"], dirs["through"])
+    cache = CalibrationCache(str(tmp_path / "cache"))
+
+    cal, standards = load_two_port_cals(*args, cache=cache)
+    assert len(cache.entries()) == 1
+
+    def fail(self):
+        raise AssertionError("calibrate() should not run on a cache hit")
+
+    monkeypatch.setattr(TwoPortCalibration, "calibrate", fail)
+    cached, cached_standards = load_two_port_cals(*args, cache=cache)
+    for key, value in cal.cals().items():
+        np.testing.assert_array_equal(cached.cals()[key], value)
+    for key, value in standards.items():
+        np.testing.assert_array_equal(cached_standards[key], value)
+    monkeypatch.undo()
+
+    # a changed ideal value or standard file is a different entry
+    load_two_port_cals(*args, s11_load=0.02, cache=cache)
+    data = {"data": {"real": [0.1] * 16, "imag": [0.0] * 16}}
+    (tmp_path / "load" / "s11.json").write_text(json.dumps(data))
+    changed, _ = load_two_port_cals(*args, cache=cache)
+    assert len(cache.entries()) == 3
+    assert not np.allclose(changed.e00, cal.e00)
+
+    # LRU eviction keeps the cache under its size limit
+    cache.max_bytes = cache.entries()[-1][2]
+    cache.evict()
+    assert len(cache.entries()) == 1
+
+
+def test_cached_loading_shares_one_entry_across_dtypes(tmp_path):
+    dirs = _write_standards(tmp_path, np.random.default_rng(24))
+    args = (dirs["open"], dirs["short"], dirs["load"], dirs["through"])
+    cache = CalibrationCache(str(tmp_path / "cache"))
+
+    single, _ = load_two_port_cals(*args, cache=cache, dtype=np.complex64)
+    full, _ = load_two_port_cals(*args, cache=cache)
+    cached_single, _ = load_two_port_cals(*args, cache=cache, dtype=np.complex64)
+    assert len(cache.entries()) == 1
+    for key, value in full.cals().items():
+        assert value.dtype == np.complex128
+        assert single.cals()[key].dtype == np.complex64
+        np.testing.assert_array_equal(single.cals()[key], value.astype(np.complex64))
+        np.testing.assert_array_equal(cached_single.cals()[key], single.cals()[key])